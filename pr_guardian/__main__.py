@@ -76,8 +76,10 @@ async def _run_review(repo: str, pr_number: int, branch: str) -> FinalReport:
     ))
 
     orchestrator = Orchestrator()
-    report = await orchestrator.review_pr(repo, pr_number, branch)
-    return report
+    try:
+        return await orchestrator.review_pr(repo, pr_number, branch)
+    finally:
+        orchestrator.close()
 
 
 def _display_report(report: FinalReport) -> None:
@@ -138,11 +140,11 @@ def _display_report(report: FinalReport) -> None:
 
 
 # ════════════════════════════════════════════
-#  WEBHOOK SERVER (FastAPI)
+#  WEBHOOK SERVER (Starlette)
 # ════════════════════════════════════════════
 
 def _run_server(port: int) -> None:
-    """Lance le serveur FastAPI pour recevoir les webhooks GitHub."""
+    """Lance le serveur Starlette pour recevoir les webhooks GitHub."""
     try:
         import uvicorn
         from pr_guardian.webhook import create_app
@@ -153,10 +155,11 @@ def _run_server(port: int) -> None:
             title="🛡️ PR-Guardian Server",
         ))
         app = create_app()
-        uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
+        # loop="auto" : uvloop s'il est installé, sinon la boucle asyncio standard
+        uvicorn.run(app, host="0.0.0.0", port=port, log_level="info", loop="auto")
     except ImportError:
-        console.print("[red]FastAPI/Uvicorn requis pour le mode serveur.[/]")
-        console.print("pip install fastapi uvicorn")
+        console.print("[red]Starlette/Uvicorn requis pour le mode serveur.[/]")
+        console.print("pip install starlette uvicorn")
         sys.exit(1)
 
 
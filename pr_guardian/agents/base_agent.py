@@ -27,10 +27,14 @@ class BaseAgent(ABC):
         ...
 
     def _log_start(self, context: PRContext) -> None:
-        self.logger.info(f"[{self.name}] Démarrage — PR {context.repo}#{context.pr_number}")
+        self.logger.info(
+            "[%s] Démarrage — PR %s#%s", self.name, context.repo, context.pr_number
+        )
 
     def _log_done(self, context: PRContext) -> None:
-        self.logger.info(f"[{self.name}] Terminé — PR {context.repo}#{context.pr_number}")
+        self.logger.info(
+            "[%s] Terminé — PR %s#%s", self.name, context.repo, context.pr_number
+        )
 
     def _log_blocked(self, reason: str) -> None:
-        self.logger.warning(f"[{self.name}] BLOQUÉ — {reason}")
+        self.logger.warning("[%s] BLOQUÉ — %s", self.name, reason)
@@ -15,8 +15,10 @@ Phase 2 : analyse LLM sémantique (Cohere)
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import re
 from typing import Any
 
 import cohere
@@ -25,11 +27,18 @@ from pr_guardian.agents.base_agent import BaseAgent
 from pr_guardian.config import get_settings
 from pr_guardian.integrations.github_client import GitHubClient
 from pr_guardian.models import CodeAnalysisResult, ModifiedFile, PRContext
-from pr_guardian.parsers.diff_parser import DiffParser
+from pr_guardian.parsers.diff_parser import DiffParser, FileDiff
+from pr_guardian.utils.cpu_pool import run_cpu
 from pr_guardian.utils.helpers import extract_language
 
 logger = logging.getLogger("pr_guardian.agent.CodeAnalyst")
 
+# ── Catégorisation des fichiers (compilée une fois, appliquée au chemin en minuscules) ──
+
+_TEST_RE = re.compile(r"test|spec")
+_MIGRATION_RE = re.compile(r"migration|alembic|flyway")
+_SENSITIVE_RE = re.compile(r"auth|security|password|token|secret|payment|billing|crypto")
+
 # ── Prompt système pour l'analyse de code ──
 
 CODE_ANALYST_SYSTEM_PROMPT = """\
@@ -77,7 +86,10 @@ class CodeAnalystAgent(BaseAgent):
         self._log_start(context)
 
         gh = self._get_github()
-        files = gh.get_modified_files(context.repo, context.pr_number)
+        # Récupération (PyGithub, bloquant) dans un thread, parsing (CPU) dans
+        # le pool de processus : la boucle d'événements reste libre
+        files = await asyncio.to_thread(gh.get_modified_files, context.repo, context.pr_number)
+        diffs = await run_cpu(self._parse_patches, [(f.patch, f.filename) for f in files])
 
         result = CodeAnalysisResult(
             files_modified=files,
@@ -98,13 +110,12 @@ class CodeAnalystAgent(BaseAgent):
         sensitive: list[str] = []
         all_patches: list[str] = []
 
-        for f in files:
+        for f, diff_info in zip(files, diffs):
             lang = extract_language(f.filename)
             f.language = lang
 
-            # Parser le diff
-            if f.patch:
-                diff_info = DiffParser.parse_patch(f.patch, f.filename)
+            # Symboles extraits du diff
+            if diff_info is not None:
                 all_classes.extend(diff_info.classes_modified)
                 all_methods.extend(diff_info.functions_modified)
                 all_endpoints.extend(diff_info.endpoints_detected)
@@ -114,19 +125,18 @@ class CodeAnalystAgent(BaseAgent):
             lower = f.filename.lower()
 
             # Tests
-            if "test" in lower or "spec" in lower:
+            if _TEST_RE.search(lower):
                 if f.status == "added":
                     tests_added.append(f.filename)
                 else:
                     tests_modified.append(f.filename)
 
             # Migrations
-            if "migration" in lower or "alembic" in lower or "flyway" in lower:
+            if _MIGRATION_RE.search(lower):
                 migrations.append(f.filename)
 
             # Points sensibles
-            if any(kw in lower for kw in ("auth", "security", "password", "token", "secret",
-                                           "payment", "billing", "crypto")):
+            if _SENSITIVE_RE.search(lower):
                 sensitive.append(f"⚠️ Fichier sensible : {f.filename}")
 
             # Détection de features par nom de fichier / chemin
@@ -154,6 +164,14 @@ class CodeAnalystAgent(BaseAgent):
         self._log_done(context)
         return result
 
+    @staticmethod
+    def _parse_patches(patches: list[tuple[str, str]]) -> list[FileDiff | None]:
+        """Parse les couples (patch, fichier) — None pour les fichiers sans patch."""
+        return [
+            DiffParser.parse_patch(patch, filename) if patch else None
+            for patch, filename in patches
+        ]
+
     def _llm_analyze(self, patches: list[str], context: PRContext) -> dict | None:
         """Appelle Cohere pour une analyse sémantique approfondie du diff."""
         try:
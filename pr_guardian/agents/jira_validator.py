@@ -159,11 +159,9 @@ class JiraValidatorAgent(BaseAgent):
         """Appelle Cohere pour évaluer sémantiquement chaque critère."""
         try:
             # Formater les critères
-            criteria_text = ""
-            for i, ac in enumerate(ac_texts, 1):
-                criteria_text += f"AC-{i}: {ac}\n"
-            for i, dod in enumerate(dod_texts, 1):
-                criteria_text += f"DoD-{i}: {dod}\n"
+            criteria_lines = [f"AC-{i}: {ac}\n" for i, ac in enumerate(ac_texts, 1)]
+            criteria_lines += [f"DoD-{i}: {dod}\n" for i, dod in enumerate(dod_texts, 1)]
+            criteria_text = "".join(criteria_lines)
 
             # Formater les preuves
             code_info = (
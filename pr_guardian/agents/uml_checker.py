@@ -26,6 +26,7 @@ from pr_guardian.models import (
     PRContext,
     Severity,
     UMLCheckResult,
+    UMLDiagram,
     UMLMismatch,
 )
 from pr_guardian.parsers.plantuml_parser import PlantUMLParser
@@ -75,12 +76,25 @@ class UMLCheckerAgent(BaseAgent):
         super().__init__()
         self._gh = github_client
         self._settings = get_settings()
+        # (repo, branch, path) → (contenu, diagramme) : évite de re-télécharger
+        # et reparser les UML lors de la seconde passe de l'orchestrateur.
+        self._diagram_cache: dict[tuple[str, str, str], tuple[str, UMLDiagram]] = {}
 
     def _get_github(self) -> GitHubClient:
         if self._gh is None:
             self._gh = GitHubClient()
         return self._gh
 
+    def _load_diagram(self, repo: str, path: str, branch: str) -> tuple[str, UMLDiagram]:
+        """Récupère et parse un fichier UML, avec cache par instance."""
+        key = (repo, branch, path)
+        cached = self._diagram_cache.get(key)
+        if cached is None:
+            content = self._get_github().get_file_content(repo, path, branch)
+            cached = (content, PlantUMLParser.parse(content, filepath=path))
+            self._diagram_cache[key] = cached
+        return cached
+
     async def run(
         self,
         context: PRContext,
@@ -107,8 +121,9 @@ class UMLCheckerAgent(BaseAgent):
         uml_contents: list[str] = []
         for path in uml_paths:
             try:
-                content = gh.get_file_content(context.repo, path, context.branch or "main")
-                diagram = PlantUMLParser.parse(content, filepath=path)
+                content, diagram = self._load_diagram(
+                    context.repo, path, context.branch or "main"
+                )
                 result.diagrams_found.append(diagram)
                 uml_contents.append(f"--- {path} ---\n{content}")
             except Exception as exc:
@@ -27,6 +27,17 @@ class Settings(BaseSettings):
     # GitHub
     github_token: str = Field(default="", description="GitHub personal access token")
     github_api_url: str = Field(default="https://api.github.com")
+    github_webhook_secret: str = Field(default="", description="Secret des webhooks GitHub")
+    max_concurrent_reviews: int = Field(
+        default=4, ge=1, description="Revues webhook exécutées en parallèle"
+    )
+    review_queue_size: int = Field(
+        default=100, ge=1, description="Revues webhook en attente avant refus (503)"
+    )
+    redis_url: str = Field(default="", description="Redis pour dédupliquer les webhooks")
+    review_queue: Literal["local", "redis"] = Field(
+        default="local", description="local : revues dans le serveur ; redis : workers séparés"
+    )
 
     # Jira
     jira_base_url: str = Field(default="")
@@ -54,6 +65,10 @@ class Settings(BaseSettings):
 
     # Général
     log_level: str = Field(default="INFO")
+    cpu_workers: int = Field(
+        default=2, ge=0, description="Processus pour le parsing (0 = thread)"
+    )
+    plain_logs: bool = Field(default=False, description="Logs texte brut (sans Rich)")
     language: str = Field(default="fr")
 
     model_config = {
@@ -26,18 +26,22 @@ class FigmaClient:
 
     BASE_URL = "https://api.figma.com/v1"
 
-    def __init__(self, token: str | None = None):
+    def __init__(
+        self, token: str | None = None, session: requests.Session | None = None
+    ):
         settings = get_settings()
         self._token = token or settings.figma_access_token
         if not self._token:
             raise ValueError("FIGMA_ACCESS_TOKEN non configuré.")
         self._headers = {"X-Figma-Token": self._token}
+        # Session partagée (keep-alive) si fournie par l'orchestrateur
+        self._session = session or requests.Session()
 
     # ── Helpers ─────────────────────────────
 
     def _get(self, path: str, params: dict | None = None) -> dict:
         url = f"{self.BASE_URL}/{path}"
-        resp = requests.get(url, headers=self._headers, params=params, timeout=30)
+        resp = self._session.get(url, headers=self._headers, params=params, timeout=30)
         resp.raise_for_status()
         return resp.json()
 
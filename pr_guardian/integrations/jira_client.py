@@ -24,25 +24,27 @@ logger = logging.getLogger("pr_guardian.jira")
 class JiraClient:
     """Client REST Jira Cloud (Atlassian)."""
 
-    def __init__(self):
+    def __init__(self, session: requests.Session | None = None):
         settings = get_settings()
         if not settings.jira_configured:
             raise ValueError("Jira non configuré (JIRA_BASE_URL / JIRA_API_TOKEN manquant).")
         self._base_url = settings.jira_base_url.rstrip("/")
         self._auth = (settings.jira_user_email, settings.jira_api_token)
         self._headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        # Session partagée (keep-alive) si fournie par l'orchestrateur
+        self._session = session or requests.Session()
 
     # ── Helpers HTTP ────────────────────────
 
     def _get(self, path: str, params: dict | None = None) -> dict:
         url = f"{self._base_url}/rest/api/3/{path}"
-        resp = requests.get(url, auth=self._auth, headers=self._headers, params=params, timeout=30)
+        resp = self._session.get(url, auth=self._auth, headers=self._headers, params=params, timeout=30)
         resp.raise_for_status()
         return resp.json()
 
     def _post(self, path: str, json_data: dict) -> dict:
         url = f"{self._base_url}/rest/api/3/{path}"
-        resp = requests.post(
+        resp = self._session.post(
             url, auth=self._auth, headers=self._headers, json=json_data, timeout=30
         )
         resp.raise_for_status()
@@ -179,7 +181,7 @@ class JiraClient:
                 ]
             }
         url = f"{self._base_url}/rest/api/3/issue/{issue_key}/transitions"
-        resp = requests.post(
+        resp = self._session.post(
             url, auth=self._auth, headers=self._headers, json=payload, timeout=30
         )
         resp.raise_for_status()
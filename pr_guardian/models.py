@@ -11,7 +11,7 @@ from datetime import UTC, datetime
 from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 
 # ════════════════════════════════════════════
@@ -98,6 +98,8 @@ class CodeAnalysisResult(BaseModel):
 # ════════════════════════════════════════════
 
 class UMLEntity(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     entity_type: str = ""  # class, interface, actor, component…
     attributes: list[str] = Field(default_factory=list)
@@ -105,6 +107,8 @@ class UMLEntity(BaseModel):
 
 
 class UMLRelation(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     source: str
     target: str
     relation_type: str = ""  # inheritance, composition, association, dependency…
@@ -118,8 +122,33 @@ class UMLDiagram(BaseModel):
     relations: list[UMLRelation] = Field(default_factory=list)
     raw_content: str = ""
 
+    # (liste indexée, taille, index) — recalculé si `entities` est remplacée
+    # (model_copy…) ou change de taille (append, remove…)
+    _entity_index: tuple[list[UMLEntity], int, dict[str, UMLEntity]] | None = PrivateAttr(
+        default=None
+    )
+
+    @property
+    def entities_by_name(self) -> dict[str, UMLEntity]:
+        """
+        Index des entités par nom, construit au premier accès (non sérialisé).
+
+        Invariant : l'index suit le remplacement de la liste ``entities`` et
+        les ajouts / suppressions ; remplacer un élément sur place
+        (``entities[i] = ...``) n'est pas détecté — réassigner la liste.
+        """
+        entities = self.entities
+        cached = self._entity_index
+        if cached is None or cached[0] is not entities or cached[1] != len(entities):
+            cached = self._entity_index = (
+                entities, len(entities), {e.name: e for e in entities}
+            )
+        return cached[2]
+
 
 class UMLMismatch(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     diagram_file: str
     element: str
     issue: str  # "classe manquante", "relation absente"…
@@ -140,6 +169,8 @@ class UMLCheckResult(BaseModel):
 # ════════════════════════════════════════════
 
 class FigmaRequirement(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     frame_id: str = ""
     frame_name: str = ""
     page_name: str = ""
@@ -150,6 +181,8 @@ class FigmaRequirement(BaseModel):
 
 
 class FigmaMapping(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     requirement: FigmaRequirement
     implementation_status: CheckStatus = CheckStatus.FAIL
     evidence: str = ""
@@ -196,6 +229,8 @@ class JiraValidationResult(BaseModel):
 # ════════════════════════════════════════════
 
 class MustFixItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     description: str
     location: str = ""  # fichier / classe / diagram / frame
     suggestion: str = ""
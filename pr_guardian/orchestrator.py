@@ -12,7 +12,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+from typing import Any, Awaitable
+
+import requests
+from requests.adapters import HTTPAdapter
 
 from pr_guardian.agents.code_analyst import CodeAnalystAgent
 from pr_guardian.agents.figma_checker import FigmaCheckerAgent
@@ -38,6 +41,15 @@ from pr_guardian.models import (
 
 logger = logging.getLogger("pr_guardian.orchestrator")
 
+# ── Constantes du commentaire PR ────────────
+_VERDICT_EMOJI = {Verdict.PASS: "✅", Verdict.FAIL: "❌"}
+_TABLE_HEADER = (
+    "### Table de validation",
+    "| Catégorie | Item | Statut | Preuve |",
+    "|-----------|------|--------|--------|",
+)
+_COMMENT_FOOTER = ("", "---", "*PR-Guardian Orchestrator — Team7*")
+
 
 class Orchestrator:
     """
@@ -47,13 +59,29 @@ class Orchestrator:
     jusqu'à la notification finale.
     """
 
-    def __init__(self):
+    def __init__(self, github_client: GitHubClient | None = None):
         self._settings = get_settings()
-        self._gh: GitHubClient | None = None
+        self._http = self._build_http_session()
+        self._gh = github_client
         self._jira: JiraClient | None = None
         self._figma: FigmaClient | None = None
         self._email: EmailClient | None = None
 
+    # ── Session HTTP partagée ───────────────
+
+    @staticmethod
+    def _build_http_session() -> requests.Session:
+        """Session keep-alive partagée par les clients Jira et Figma."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Ferme les connexions HTTP ouvertes par l'orchestrateur."""
+        self._http.close()
+
     # ── Lazy init des clients ───────────────
 
     def _get_github(self) -> GitHubClient:
@@ -64,17 +92,17 @@ class Orchestrator:
     def _get_jira(self) -> JiraClient | None:
         if self._jira is None and self._settings.jira_configured:
             try:
-                self._jira = JiraClient()
+                self._jira = JiraClient(session=self._http)
             except Exception as exc:
-                logger.warning(f"Jira non disponible : {exc}")
+                logger.warning("Jira non disponible : %s", exc)
         return self._jira
 
     def _get_figma(self) -> FigmaClient | None:
         if self._figma is None and self._settings.figma_configured:
             try:
-                self._figma = FigmaClient()
+                self._figma = FigmaClient(session=self._http)
             except Exception as exc:
-                logger.warning(f"Figma non disponible : {exc}")
+                logger.warning("Figma non disponible : %s", exc)
         return self._figma
 
     def _get_email(self) -> EmailClient | None:
@@ -98,14 +126,15 @@ class Orchestrator:
         Returns:
             FinalReport avec verdict, validation table, emails, actions Jira.
         """
-        logger.info(f"🛡️ PR-Guardian — Début de la revue : {repo}#{pr_number}")
+        logger.info("🛡️ PR-Guardian — Début de la revue : %s#%s", repo, pr_number)
 
         # ── ÉTAPE 0 : Récupération contextuelle ──
         context = await self._step0_context(repo, pr_number, branch)
         logger.info(
-            f"📋 Contexte : Jira={context.jira_key}, "
-            f"Figma={'oui' if context.figma_link else 'non'}, "
-            f"UML={len(context.uml_files)} fichier(s)"
+            "📋 Contexte : Jira=%s, Figma=%s, UML=%d fichier(s)",
+            context.jira_key,
+            "oui" if context.figma_link else "non",
+            len(context.uml_files),
         )
 
         # ── ÉTAPE 1 : Exécution parallèle Agents 1→4 ──
@@ -123,8 +152,8 @@ class Orchestrator:
             jira_validation=jira_validation,
         )
         logger.info(
-            f"⚖️ Verdict Judge : {verdict.verdict.value} "
-            f"(confiance: {verdict.confidence_score}/100)"
+            "⚖️ Verdict Judge : %s (confiance: %d/100)",
+            verdict.verdict.value, verdict.confidence_score,
         )
 
         # ── ÉTAPE 3 : Reporter + Actions ──
@@ -133,7 +162,7 @@ class Orchestrator:
             code_analysis, uml_check, figma_check, jira_validation,
         )
 
-        logger.info(f"✅ PR-Guardian — Revue terminée : {verdict.verdict.value}")
+        logger.info("✅ PR-Guardian — Revue terminée : %s", verdict.verdict.value)
         return report
 
     # ════════════════════════════════════════
@@ -155,28 +184,29 @@ class Orchestrator:
         jira_key = gh.extract_jira_key(context)
         if jira_key:
             context.jira_key = jira_key
-            logger.info(f"🔑 Jira key extraite : {jira_key}")
+            logger.info("🔑 Jira key extraite : %s", jira_key)
 
         # Recherche lien Figma
         figma_links = gh.find_figma_links(repo, context.branch or "main")
 
         # Aussi chercher dans Jira si disponible
-        if jira_key and self._get_jira():
+        jira = self._get_jira() if jira_key else None
+        if jira:
             try:
-                jira_fields = self._get_jira().get_issue_fields(jira_key)
+                jira_fields = jira.get_issue_fields(jira_key)
                 figma_links.extend(jira_fields.get("figma_links", []))
             except Exception:
                 pass
 
         if figma_links:
             context.figma_link = figma_links[0]
-            logger.info(f"🎨 Figma trouvé : {context.figma_link}")
+            logger.info("🎨 Figma trouvé : %s", context.figma_link)
 
         # Recherche fichiers UML
         uml_files = gh.find_uml_files(repo, context.branch or "main")
         context.uml_files = uml_files
         if uml_files:
-            logger.info(f"📐 {len(uml_files)} fichier(s) UML trouvé(s)")
+            logger.info("📐 %d fichier(s) UML trouvé(s)", len(uml_files))
 
         return context
 
@@ -247,7 +277,7 @@ class Orchestrator:
         try:
             return await agent.run(context, **kwargs)
         except Exception as exc:
-            logger.error(f"[{agent.name}] Erreur : {exc}")
+            logger.error("[%s] Erreur : %s", agent.name, exc)
             return exc
 
     # ════════════════════════════════════════
@@ -283,7 +313,14 @@ class Orchestrator:
         return report
 
     async def _execute_actions(self, context: PRContext, report: FinalReport) -> None:
-        """Exécute les actions post-verdict (email, Jira, commentaire PR)."""
+        """
+        Exécute les actions post-verdict (email, Jira, commentaire PR).
+
+        Les clients sont synchrones (smtplib, requests, PyGithub) : chaque action
+        tourne dans un thread via asyncio.to_thread, et les trois actions —
+        indépendantes — sont lancées en parallèle.
+        """
+        actions: list[Awaitable[Any]] = []
 
         # 1. Email
         email_client = self._get_email()
@@ -298,44 +335,56 @@ class Orchestrator:
                         subject=f"PR-Guardian — {report.verdict.verdict.value} — PR #{context.pr_number}",
                         body_html=report.dev_email_draft,
                     )
-                    email_client.send(payload)
+                    actions.append(asyncio.to_thread(email_client.send, payload))
                 else:
                     logger.warning("Email dev non envoyé : adresse auteur inconnue.")
 
         # 2. Jira transition
         jira = self._get_jira()
         if jira and report.jira_transition_payload:
-            try:
-                jira.transition_issue(
-                    report.jira_transition_payload["issue_key"],
-                    report.jira_transition_payload["transition_id"],
-                    report.jira_transition_payload.get("comment", ""),
-                )
-            except Exception as exc:
-                logger.error(f"Jira transition échouée : {exc}")
+            actions.append(self._transition_jira(jira, report.jira_transition_payload))
 
         # 3. Commentaire PR (optionnel)
+        actions.append(self._post_pr_comment(context, report))
+
+        await asyncio.gather(*actions)
+
+    @staticmethod
+    async def _transition_jira(jira: JiraClient, payload: dict[str, Any]) -> None:
+        """Transitionne l'issue Jira sans bloquer la boucle d'événements."""
+        try:
+            await asyncio.to_thread(
+                jira.transition_issue,
+                payload["issue_key"],
+                payload["transition_id"],
+                payload.get("comment", ""),
+            )
+        except Exception as exc:
+            logger.error("Jira transition échouée : %s", exc)
+
+    async def _post_pr_comment(self, context: PRContext, report: FinalReport) -> None:
+        """Poste le commentaire de revue sur la PR sans bloquer la boucle d'événements."""
         try:
             gh = self._get_github()
             comment_body = self._format_pr_comment(report)
-            gh.post_pr_comment(context.repo, context.pr_number, comment_body)
+            await asyncio.to_thread(
+                gh.post_pr_comment, context.repo, context.pr_number, comment_body
+            )
         except Exception as exc:
-            logger.warning(f"Commentaire PR non posté : {exc}")
+            logger.warning("Commentaire PR non posté : %s", exc)
 
     @staticmethod
     def _format_pr_comment(report: FinalReport) -> str:
         """Formate le commentaire à poster sur la PR."""
         v = report.verdict
-        emoji = "✅" if v.verdict == Verdict.PASS else ("❌" if v.verdict == Verdict.FAIL else "🚫")
+        emoji = _VERDICT_EMOJI.get(v.verdict, "🚫")
 
         lines = [
             f"## {emoji} PR-Guardian — {v.verdict.value} (score: {v.confidence_score}/100)",
             "",
+            "### Justification",
         ]
-
-        lines.append("### Justification")
-        for j in v.justification:
-            lines.append(f"- {j}")
+        lines.extend([f"- {j}" for j in v.justification])
         lines.append("")
 
         if v.must_fix:
@@ -348,14 +397,11 @@ class Orchestrator:
                     lines.append(f"  💡 {mf.suggestion}")
             lines.append("")
 
-        lines.append("### Table de validation")
-        lines.append("| Catégorie | Item | Statut | Preuve |")
-        lines.append("|-----------|------|--------|--------|")
-        for row in report.validation_table:
-            lines.append(f"| {row.category} | {row.item} | {row.status.value} | {row.evidence} |")
-
-        lines.append("")
-        lines.append("---")
-        lines.append("*PR-Guardian Orchestrator — Team7*")
+        lines.extend(_TABLE_HEADER)
+        lines.extend([
+            f"| {row.category} | {row.item} | {row.status.value} | {row.evidence} |"
+            for row in report.validation_table
+        ])
+        lines.extend(_COMMENT_FOOTER)
 
         return "\n".join(lines)
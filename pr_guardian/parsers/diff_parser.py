@@ -68,8 +68,10 @@ class DiffParser:
         diff = FileDiff(filename=filename)
         current_hunk: DiffHunk | None = None
 
+        hunk_re = cls._HUNK_RE
         for line in patch.splitlines():
-            hunk_match = cls._HUNK_RE.match(line)
+            # Seules les lignes « @@ » peuvent être des en-têtes de hunk
+            hunk_match = hunk_re.match(line) if line.startswith("@@") else None
             if hunk_match:
                 current_hunk = DiffHunk(
                     old_start=int(hunk_match.group(1)),
@@ -10,7 +10,10 @@ Parse les fichiers .puml/.plantuml pour en extraire :
 
 from __future__ import annotations
 
+import os
 import re
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
 from pr_guardian.models import UMLDiagram, UMLEntity, UMLRelation
@@ -58,41 +61,72 @@ class PlantUMLParser:
         r"(?:\s*:\s*(.+))?",
     )
 
+    # Relations simples : A --|> B, A ..> B, A --> B : label
+    _SIMPLE_RELATION_RE = re.compile(
+        r"(\w+)\s+([-.<>|*o#}{:]+)\s+(\w+)\s*(?::\s*(.+))?"
+    )
+
+    # Mots-clés PlantUML à ne pas prendre pour une source de relation
+    _KEYWORDS = frozenset({
+        "class", "interface", "enum", "abstract", "actor",
+        "participant", "package", "start", "stop", "end",
+    })
+
+    # Classification des flèches : correspondance exacte des formes usuelles
+    _ARROW_TYPES = {
+        "--|>": "inheritance", "<|--": "inheritance",
+        "..|>": "implementation", "<|..": "implementation",
+        "--*": "composition", "*--": "composition",
+        "--o": "aggregation", "o--": "aggregation",
+        "-->": "association", "<--": "association",
+        "..>": "dependency", "<..": "dependency",
+        "->": "message", "<-": "message",
+    }
+
     # ── API publique ────────────────────────
 
     @classmethod
     def parse(cls, content: str, filepath: str = "") -> UMLDiagram:
-        """Parse du contenu PlantUML et retourne un UMLDiagram."""
-        diagram_type = cls._detect_type(content)
-        entities = cls._extract_entities(content, diagram_type)
-        relations = cls._extract_relations(content)
+        """
+        Parse du contenu PlantUML et retourne un UMLDiagram.
+
+        L'analyse est mémoïsée par contenu : un diagramme inchangé d'une revue
+        à l'autre n'est parsé qu'une fois. Les entités et relations (immuables)
+        sont partagées, mais chaque appel reçoit un UMLDiagram et des listes neufs.
+        """
+        diagram_type, entities, relations = _parse_content_cached(content)
 
         return UMLDiagram(
             filepath=filepath,
             diagram_type=diagram_type,
-            entities=entities,
-            relations=relations,
+            entities=list(entities),
+            relations=list(relations),
             raw_content=content,
         )
 
     @classmethod
     def parse_file(cls, filepath: str) -> UMLDiagram:
-        """Lit et parse un fichier PlantUML."""
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
-        return cls.parse(content, filepath)
+        """
+        Lit et parse un fichier PlantUML.
+
+        Le résultat est mis en cache par (chemin, mtime, taille) : un fichier
+        inchangé n'est ni relu ni reparsé. Chaque appel reçoit une copie du
+        diagramme en cache, qu'il peut modifier librement.
+        """
+        st = os.stat(filepath)
+        return _parse_file_cached(filepath, st.st_mtime_ns, st.st_size).model_copy(deep=True)
 
     # ── Détection type ──────────────────────
 
     @classmethod
     def _detect_type(cls, content: str) -> str:
-        scores: dict[str, int] = {}
-        for dtype, pattern in cls._DIAGRAM_TYPE_PATTERNS.items():
-            matches = pattern.findall(content)
-            scores[dtype] = len(matches)
-        if not scores or max(scores.values()) == 0:
-            return "unknown"
-        return max(scores, key=scores.get)  # type: ignore
+        # Compter sans matérialiser la liste des matches (findall)
+        scores = {
+            dtype: sum(1 for _ in pattern.finditer(content))
+            for dtype, pattern in cls._DIAGRAM_TYPE_PATTERNS.items()
+        }
+        best = max(scores, key=scores.__getitem__)
+        return best if scores[best] else "unknown"
 
     # ── Extraction entités ──────────────────
 
@@ -152,49 +186,67 @@ class PlantUMLParser:
     @classmethod
     def _extract_relations(cls, content: str) -> list[UMLRelation]:
         relations: list[UMLRelation] = []
-        # Patterns de relation simples
-        rel_patterns = [
-            # A --|> B, A ..> B, A --> B, etc.
-            re.compile(
-                r"(\w+)\s+([-.<>|*o#}{:]+)\s+(\w+)\s*(?::\s*(.+))?"
-            ),
-        ]
-        for pattern in rel_patterns:
-            for match in pattern.finditer(content):
-                source = match.group(1).strip()
-                arrow = match.group(2).strip()
-                target = match.group(3).strip()
-                label = (match.group(4) or "").strip()
-
-                # Ignorer les mots-clés PlantUML
-                if source.lower() in ("class", "interface", "enum", "abstract", "actor",
-                                       "participant", "package", "start", "stop", "end"):
-                    continue
-
-                rel_type = cls._classify_relation(arrow)
-                relations.append(UMLRelation(
-                    source=source,
-                    target=target,
-                    relation_type=rel_type,
-                    label=label,
-                ))
+        for match in cls._SIMPLE_RELATION_RE.finditer(content):
+            source = match.group(1).strip()
+            arrow = match.group(2).strip()
+            target = match.group(3).strip()
+            label = (match.group(4) or "").strip()
+
+            # Ignorer les mots-clés PlantUML
+            if source.lower() in cls._KEYWORDS:
+                continue
+
+            rel_type = cls._classify_relation(arrow)
+            relations.append(UMLRelation(
+                source=source,
+                target=target,
+                relation_type=rel_type,
+                label=label,
+            ))
         return relations
 
-    @staticmethod
-    def _classify_relation(arrow: str) -> str:
+    @classmethod
+    def _classify_relation(cls, arrow: str) -> str:
         """Classifie le type de relation à partir de la flèche."""
-        if "--|>" in arrow or "<|--" in arrow:
-            return "inheritance"
-        if "..|>" in arrow or "<|.." in arrow:
-            return "implementation"
-        if "--*" in arrow or "*--" in arrow:
-            return "composition"
-        if "--o" in arrow or "o--" in arrow:
-            return "aggregation"
-        if "-->" in arrow or "<--" in arrow:
-            return "association"
-        if "..>" in arrow or "<.." in arrow:
-            return "dependency"
-        if "->" in arrow or "<-" in arrow:
-            return "message"
-        return "unknown"
+        rel_type = cls._ARROW_TYPES.get(arrow)
+        if rel_type is None:
+            rel_type = _classify_arrow_fallback(arrow)
+        return rel_type
+
+
+@lru_cache(maxsize=256)
+def _classify_arrow_fallback(arrow: str) -> str:
+    """Flèches non canoniques (---|>, -[#red]->…) : recherche par sous-chaîne."""
+    if "--|>" in arrow or "<|--" in arrow:
+        return "inheritance"
+    if "..|>" in arrow or "<|.." in arrow:
+        return "implementation"
+    if "--*" in arrow or "*--" in arrow:
+        return "composition"
+    if "--o" in arrow or "o--" in arrow:
+        return "aggregation"
+    if "-->" in arrow or "<--" in arrow:
+        return "association"
+    if "..>" in arrow or "<.." in arrow:
+        return "dependency"
+    if "->" in arrow or "<-" in arrow:
+        return "message"
+    return "unknown"
+
+
+@lru_cache(maxsize=128)
+def _parse_content_cached(
+    content: str,
+) -> tuple[str, tuple[UMLEntity, ...], tuple[UMLRelation, ...]]:
+    """Type, entités et relations d'un contenu PlantUML (mémoïsés par contenu)."""
+    diagram_type = PlantUMLParser._detect_type(content)
+    entities = PlantUMLParser._extract_entities(content, diagram_type)
+    relations = PlantUMLParser._extract_relations(content)
+    return diagram_type, tuple(entities), tuple(relations)
+
+
+@lru_cache(maxsize=64)
+def _parse_file_cached(filepath: str, mtime_ns: int, size: int) -> UMLDiagram:
+    """Lecture + parsing mémoïsés ; mtime/size ne servent que de clé de cache."""
+    content = Path(filepath).read_bytes().decode("utf-8", errors="replace")
+    return PlantUMLParser.parse(content, filepath)
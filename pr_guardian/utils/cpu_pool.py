@@ -0,0 +1,63 @@
+"""
+Pool de processus pour les phases CPU — PR-Guardian.
+
+Le parsing (diffs, regex) est déporté hors de la boucle d'événements pour
+que le serveur webhook et les autres agents restent réactifs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from pr_guardian.config import get_settings
+
+logger = logging.getLogger("pr_guardian.cpu_pool")
+
+T = TypeVar("T")
+
+_cpu_pool: ProcessPoolExecutor | None = None
+
+
+def get_cpu_pool() -> ProcessPoolExecutor | None:
+    """Retourne le pool partagé (créé au premier appel), ou None si CPU_WORKERS=0."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        workers = get_settings().cpu_workers
+        if workers <= 0:
+            return None
+        # Jamais fork : le pool démarre dans un processus déjà multi-threadé
+        # (to_thread, PyGithub/requests) et l'enfant hériterait de verrous pris.
+        method = (
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        _cpu_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context(method)
+        )
+        logger.debug("Pool CPU démarré (%d processus, %s)", workers, method)
+    return _cpu_pool
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Exécute une fonction CPU pure dans le pool de processus.
+
+    `fn` et ses arguments doivent être picklables. Sans pool, repli sur
+    un thread (asyncio.to_thread).
+    """
+    pool = get_cpu_pool()
+    if pool is None:
+        return await asyncio.to_thread(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+
+def shutdown_cpu_pool() -> None:
+    """Arrête le pool partagé (fin du serveur)."""
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
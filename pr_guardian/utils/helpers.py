@@ -8,12 +8,16 @@ import re
 from typing import Any
 
 
+_TRUNCATE_MARKER = "\n…[tronqué]…\n"
+
+
 def truncate(text: str, max_len: int = 500) -> str:
     """Tronque un texte en gardant le début et la fin."""
-    if len(text) <= max_len:
+    size = len(text)
+    if size <= max_len:
         return text
     half = max_len // 2
-    return text[:half] + "\n…[tronqué]…\n" + text[-half:]
+    return "".join((text[:half], _TRUNCATE_MARKER, text[size - half:]))
 
 
 def sanitize_for_markdown(text: str) -> str:
@@ -2,6 +2,8 @@
 Logger structuré — PR-Guardian Orchestrator.
 
 Configure un logging coloré (via Rich) avec niveaux par module.
+En mode serveur / conteneur (PLAIN_LOGS=true), un StreamHandler texte
+brut est utilisé et Rich n'est jamais importé.
 """
 
 from __future__ import annotations
@@ -9,9 +11,6 @@ from __future__ import annotations
 import logging
 import sys
 
-from rich.console import Console
-from rich.logging import RichHandler
-
 from pr_guardian.config import get_settings
 
 
@@ -28,17 +27,23 @@ def setup_logging() -> None:
     settings = get_settings()
     level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
-    console = Console(stderr=True)
-    handler = RichHandler(
-        console=console,
-        show_time=True,
-        show_path=False,
-        markup=True,
-        rich_tracebacks=True,
-    )
+    handler: logging.Handler
+    if settings.plain_logs:
+        handler = logging.StreamHandler(sys.stderr)
+        fmt = logging.Formatter("%(asctime)s %(levelname)-8s %(name)s — %(message)s")
+    else:
+        from rich.console import Console
+        from rich.logging import RichHandler
+
+        handler = RichHandler(
+            console=Console(stderr=True),
+            show_time=True,
+            show_path=False,
+            markup=True,
+            rich_tracebacks=True,
+        )
+        fmt = logging.Formatter("%(name)s — %(message)s")
     handler.setLevel(level)
-
-    fmt = logging.Formatter("%(name)s — %(message)s")
     handler.setFormatter(fmt)
 
     root = logging.getLogger("pr_guardian")
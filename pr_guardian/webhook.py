@@ -12,83 +12,456 @@ import hashlib
 import hmac
 import json
 import logging
-from typing import Any
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from urllib.parse import quote
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
 
 from pr_guardian.config import get_settings
 from pr_guardian.orchestrator import Orchestrator
+from pr_guardian.utils.cpu_pool import shutdown_cpu_pool
+from pr_guardian.worker import RedisReviewQueue, connect_review_queue
+
+try:  # orjson (optionnel) : décodage plus rapide, directement depuis les bytes
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+try:  # ijson (optionnel) : lecture en flux des seuls champs utiles
+    import ijson
+
+    # Le backend Python pur est plus lent qu'un décodage complet
+    if ijson.backend != "yajl2_c":
+        ijson = None
+except ImportError:
+    ijson = None
+
+try:  # msgspec (optionnel) : décodage typé, les champs inconnus sont ignorés
+    import msgspec
+
+    class _Head(msgspec.Struct):
+        ref: str = ""
+        sha: str = ""
+
+    class _PullRequest(msgspec.Struct):
+        number: int = 0
+        head: _Head = msgspec.field(default_factory=_Head)
+
+    class _Repository(msgspec.Struct):
+        full_name: str = ""
+
+    class _Payload(msgspec.Struct):
+        action: str = ""
+        pull_request: _PullRequest = msgspec.field(default_factory=_PullRequest)
+        repository: _Repository = msgspec.field(default_factory=_Repository)
+
+    _payload_decoder = msgspec.json.Decoder(_Payload)
+except ImportError:
+    _payload_decoder = None
 
 logger = logging.getLogger("pr_guardian.webhook")
 
+# ── État des revues (par application) ───────
+class _ReviewState:
+    """
+    Contrôle d'admission et coalescence des revues d'une application.
 
-def create_app() -> FastAPI:
-    """Crée et configure l'application FastAPI."""
-    app = FastAPI(
-        title="PR-Guardian Orchestrator",
-        description="Webhook receiver for GitHub Pull Request events",
-        version="1.0.0",
-    )
+    Condition plutôt que Semaphore : la limite peut être modifiée à chaud.
+    Seul le dernier commit d'une PR mérite une revue : un push plus récent
+    annule la revue en cours et rend obsolètes celles encore en file.
+    """
 
-    @app.get("/health")
-    async def health():
-        return {"status": "ok", "service": "pr-guardian"}
+    def __init__(self, max_reviews: int):
+        if max_reviews < 1:
+            raise ValueError("max_concurrent_reviews doit être >= 1")
+        self.admission = asyncio.Condition()
+        self.active = 0
+        self.max = max_reviews
+        self.pending_sha: dict[tuple[str, int], str] = {}
+        self.inflight: dict[tuple[str, int], asyncio.Task[None]] = {}
 
-    @app.post("/webhook/github")
-    async def github_webhook(request: Request):
-        """Endpoint pour les webhooks GitHub."""
-        body = await request.body()
-        payload = json.loads(body)
+    async def set_max(self, n: int) -> None:
+        """Modifie à chaud le nombre maximal de revues exécutées en parallèle."""
+        if n < 1:
+            raise ValueError("max_concurrent_reviews doit être >= 1")
+        async with self.admission:
+            increased = n > self.max
+            self.max = n
+            if increased:  # réveiller les revues en attente
+                self.admission.notify_all()
+
+
+async def _worker(
+    queue: asyncio.Queue[tuple[str, int, str, str]],
+    orchestrator: Orchestrator,
+    state: _ReviewState,
+) -> None:
+    """Consomme la file des revues en attente."""
+    while True:
+        repo, pr_number, branch, head_sha = await queue.get()
+        key = (repo, pr_number)
+        task: asyncio.Task[None] | None = None
+        try:
+            if head_sha and state.pending_sha.get(key) != head_sha:
+                logger.info("Revue %s#%d (%s) remplacée par un push plus récent",
+                            repo, pr_number, head_sha[:7])
+                continue
+            task = asyncio.create_task(
+                _run_review_bg(state, orchestrator, repo, pr_number, branch)
+            )
+            state.inflight[key] = task
+            await asyncio.wait((task,))
+            if task.cancelled():
+                logger.info("Revue %s#%d (%s) annulée par un push plus récent",
+                            repo, pr_number, head_sha[:7])
+        finally:
+            if task is not None and state.inflight.get(key) is task:
+                del state.inflight[key]
+            if head_sha and state.pending_sha.get(key) == head_sha:
+                del state.pending_sha[key]
+            queue.task_done()
+
+
+# ── Idempotence des livraisons ──────────────
+_DELIVERY_TTL = 3600  # secondes
+
+
+class _DeliveryCache:
+    """
+    Mémorise les X-GitHub-Delivery déjà acceptés.
+
+    Redis (SET NX EX) si configuré — partagé entre processus ; sinon un
+    dictionnaire local avec expiration.
+    """
+
+    def __init__(self, redis: Any = None):
+        self._redis = redis
+        self._local: dict[str, float] = {}
+
+    async def claim(self, delivery_id: str) -> bool:
+        """True si la livraison est nouvelle, False si c'est une relivraison."""
+        if self._redis is not None:
+            try:
+                return bool(await self._redis.set(
+                    f"gh:delivery:{delivery_id}", "1", nx=True, ex=_DELIVERY_TTL
+                ))
+            except Exception as exc:
+                logger.warning("Redis indisponible (%s) — déduplication locale", exc)
+
+        now = time.monotonic()
+        if len(self._local) > 10_000:
+            self._local = {k: t for k, t in self._local.items() if t > now}
+        if self._local.get(delivery_id, 0.0) > now:
+            return False
+        self._local[delivery_id] = now + _DELIVERY_TTL
+        return True
+
+    async def release(self, delivery_id: str) -> None:
+        """Oublie une livraison refusée, pour que la relivraison soit traitée."""
+        self._local.pop(delivery_id, None)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(f"gh:delivery:{delivery_id}")
+            except Exception as exc:
+                logger.warning("Redis indisponible (%s)", exc)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+def _connect_redis(url: str) -> Any:
+    """Client redis.asyncio, ou None si non configuré / non installé."""
+    if not url:
+        return None
+    try:
+        from redis.asyncio import Redis
+    except ImportError:
+        logger.error("redis n'est pas installé — déduplication locale uniquement.")
+        return None
+    return Redis.from_url(url)
+
+
+# ── Filtrage des événements ─────────────────
+_PR_EVENT = "pull_request"
+_ALLOWED_ACTIONS: frozenset[str] = frozenset({"opened", "synchronize", "reopened"})
+
+# ── Extraction du payload ───────────────────
+# Chemins ijson → champ retenu ; le reste du payload n'est jamais matérialisé
+_PR_FIELDS = {
+    "action": "action",
+    "repository.full_name": "repo",
+    "pull_request.number": "number",
+    "pull_request.head.ref": "branch",
+    "pull_request.head.sha": "sha",
+}
+
+
+def _check_pr_fields(fields: dict[str, Any]) -> dict[str, Any]:
+    """Applique aux chemins ijson / json le typage strict des Structs msgspec."""
+    for key, value in fields.items():
+        expected = int if key == "number" else str
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError(f"Champ {key!r} mal typé : {type(value).__name__}")
+    return fields
 
-        # Vérifier l'événement
+
+def _extract_pr_fields(body: bytes) -> dict[str, Any]:
+    """
+    Extrait action / repo / numéro / branche / sha d'un payload pull_request.
+
+    Lève ValueError si le JSON est invalide ou si un champ est mal typé,
+    quel que soit le décodeur disponible.
+    """
+    if _payload_decoder is not None:
+        # msgspec.DecodeError (et ValidationError) héritent de ValueError
+        p = _payload_decoder.decode(body)
+        return {
+            "action": p.action,
+            "repo": p.repository.full_name,
+            "number": p.pull_request.number,
+            "branch": p.pull_request.head.ref,
+            "sha": p.pull_request.head.sha,
+        }
+
+    if ijson is not None:
+        found: dict[str, Any] = {}
+        try:
+            for prefix, event, value in ijson.parse(body):
+                if not prefix and event not in ("start_map", "map_key", "end_map"):
+                    raise ValueError(f"Payload non-objet : {event}")
+                key = _PR_FIELDS.get(prefix)
+                if key is None:
+                    continue
+                if event not in ("string", "number"):  # objet, liste, null, booléen
+                    raise ValueError(f"Champ {key!r} mal typé : {event}")
+                found[key] = value
+                if len(found) == len(_PR_FIELDS):
+                    break
+        except ijson.JSONError as exc:
+            raise ValueError(str(exc)) from exc
+        return _check_pr_fields(found)
+
+    payload = _json_loads(body)
+    if not isinstance(payload, dict):
+        raise ValueError(f"Payload non-objet : {type(payload).__name__}")
+    pr = payload.get("pull_request") or {}
+    repository = payload.get("repository") or {}
+    head = (pr.get("head") or {}) if isinstance(pr, dict) else {}
+    if not all(isinstance(obj, dict) for obj in (pr, repository, head)):
+        raise ValueError("Payload pull_request mal formé")
+    return _check_pr_fields({
+        "action": payload.get("action", ""),
+        "repo": repository.get("full_name", ""),
+        "number": pr.get("number", 0),
+        "branch": head.get("ref", ""),
+        "sha": head.get("sha", ""),
+    })
+
+
+def _verify_signature(body: bytes, signature: str, secret: bytes | str) -> bool:
+    """Vérifie l'en-tête X-Hub-Signature-256 (HMAC-SHA256, comparaison à temps constant)."""
+    if not signature.startswith("sha256="):
+        return False
+    key = secret.encode("utf-8") if isinstance(secret, str) else secret
+    expected = hmac.new(key, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+# ── Réponses ────────────────────────────────
+_HEALTH_BODY = b'{"status":"ok","service":"pr-guardian"}'
+_DUPLICATE_BODY = b'{"message":"duplicate"}'
+
+
+def _error(status_code: int, detail: str) -> JSONResponse:
+    """Réponse d'erreur JSON ({"detail": ...})."""
+    return JSONResponse({"detail": detail}, status_code=status_code)
+
+
+def create_app() -> Starlette:
+    """Crée et configure l'application Starlette."""
+    settings = get_settings()
+    webhook_secret = settings.github_webhook_secret.encode("utf-8")
+    if not webhook_secret:
+        logger.warning("GITHUB_WEBHOOK_SECRET non configuré — signatures non vérifiées.")
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        app.state.deliveries = _DeliveryCache(_connect_redis(settings.redis_url))
+        if settings.review_queue == "redis":
+            # Le serveur ne fait qu'accuser réception : les revues tournent
+            # dans des processus `python -m pr_guardian.worker`
+            app.state.queue = connect_review_queue(
+                settings.redis_url, settings.review_queue_size
+            )
+            try:
+                yield
+            finally:
+                await app.state.queue.close()
+                await app.state.deliveries.close()
+            return
+
+        # Producteur : l'endpoint ; consommateurs : un pool de workers fixe
+        app.state.queue = asyncio.Queue(maxsize=settings.review_queue_size)
+        # Un seul orchestrateur (clients et pool HTTP) partagé par toutes les revues
+        app.state.orchestrator = Orchestrator()
+        reviews = app.state.reviews = _ReviewState(settings.max_concurrent_reviews)
+        workers = [
+            asyncio.create_task(_worker(app.state.queue, app.state.orchestrator, reviews))
+            for _ in range(settings.max_concurrent_reviews)
+        ]
+        try:
+            yield
+        finally:
+            inflight = list(reviews.inflight.values())
+            for task in (*workers, *inflight):
+                task.cancel()
+            await asyncio.gather(*workers, *inflight, return_exceptions=True)
+            await app.state.deliveries.close()
+            app.state.orchestrator.close()
+            shutdown_cpu_pool()
+
+    async def health(request: Request) -> Response:
+        return Response(_HEALTH_BODY, media_type="application/json")
+
+    async def github_webhook(request: Request) -> Response:
+        """Endpoint pour les webhooks GitHub."""
+        # Filtrer l'événement sur l'en-tête, sans lire ni parser le corps
         event = request.headers.get("X-GitHub-Event", "")
-        if event != "pull_request":
+        if event != _PR_EVENT:
             return JSONResponse(
                 {"message": f"Événement ignoré : {event}"},
                 status_code=200,
             )
 
+        body = await request.body()
+
+        # Authentifier avant tout parsing ; `body` reste en bytes (HMAC et
+        # décodage JSON lisent le même buffer, sans .decode() intermédiaire)
+        if webhook_secret and not _verify_signature(
+            body, request.headers.get("X-Hub-Signature-256", ""), webhook_secret
+        ):
+            return _error(401, "Signature invalide.")
+
+        try:
+            fields = _extract_pr_fields(body)
+        except ValueError:
+            return _error(400, "JSON invalide.")
+
         # Vérifier l'action
-        action = payload.get("action", "")
-        if action not in ("opened", "synchronize", "reopened"):
+        action = fields.get("action", "")
+        if action not in _ALLOWED_ACTIONS:
             return JSONResponse(
                 {"message": f"Action ignorée : {action}"},
                 status_code=200,
             )
 
         # Extraire les infos PR
-        pr = payload.get("pull_request", {})
-        repo_name = payload.get("repository", {}).get("full_name", "")
-        pr_number = pr.get("number", 0)
-        branch = pr.get("head", {}).get("ref", "")
+        repo_name = fields.get("repo", "")
+        branch = fields.get("branch", "")
+        head_sha = fields.get("sha", "")
+        try:
+            pr_number = int(fields.get("number", 0))
+        except (TypeError, ValueError):
+            pr_number = 0
 
         if not repo_name or not pr_number:
-            raise HTTPException(status_code=400, detail="Payload incomplet.")
+            return _error(400, "Payload incomplet.")
 
-        logger.info(f"Webhook reçu : {repo_name}#{pr_number} ({action})")
-
-        # Lancer la revue en arrière-plan
-        asyncio.create_task(_run_review_bg(repo_name, pr_number, branch))
+        logger.info(
+            "Webhook reçu : %s#%d (%s) [delivery=%s]",
+            repo_name, pr_number, action,
+            request.headers.get("X-GitHub-Delivery", "-"),
+        )
 
-        return JSONResponse({
-            "message": "Revue déclenchée.",
-            "repo": repo_name,
-            "pr": pr_number,
-            "branch": branch,
+        # Accusé de réception minimal : pas de corps, diagnostics en en-têtes.
+        # Construit avant toute mise en file : les en-têtes sont encodés en
+        # latin-1, d'où le percent-encoding (branche « feat/日本 »).
+        ack = Response(status_code=202, headers={
+            "X-Review-Repo": quote(repo_name, safe="/"),
+            "X-Review-PR": str(pr_number),
+            "X-Review-Branch": quote(branch, safe="/"),
         })
 
-    return app
+        # Ignorer les relivraisons GitHub (même X-GitHub-Delivery)
+        deliveries: _DeliveryCache = request.app.state.deliveries
+        delivery_id = request.headers.get("X-GitHub-Delivery", "")
+        if delivery_id and not await deliveries.claim(delivery_id):
+            return Response(_DUPLICATE_BODY, media_type="application/json")
+
+        # Ce commit est déjà en file ou en cours de revue, sinon le mettre en
+        # file. Tout refus (file pleine, Redis indisponible) libère la
+        # livraison : la relivraison de GitHub doit être traitée.
+        queue = request.app.state.queue
+        external = isinstance(queue, RedisReviewQueue)
+        reviews: _ReviewState | None = None if external else request.app.state.reviews
+        key = (repo_name, pr_number)
+        try:
+            if head_sha and (
+                await queue.is_pending(repo_name, pr_number, head_sha) if reviews is None
+                else reviews.pending_sha.get(key) == head_sha
+            ):
+                return JSONResponse(
+                    {"message": "Revue déjà planifiée pour ce commit."},
+                    status_code=200,
+                )
+            if external:
+                await queue.put(repo_name, pr_number, branch, head_sha)
+            else:
+                queue.put_nowait((repo_name, pr_number, branch, head_sha))
+        except Exception as exc:
+            if delivery_id:
+                await deliveries.release(delivery_id)
+            if isinstance(exc, asyncio.QueueFull):
+                logger.warning("File des revues pleine — %s#%s refusée", repo_name, pr_number)
+            else:
+                logger.error("File Redis indisponible : %s", exc)
+            return JSONResponse(
+                {"message": "File des revues pleine, réessayez plus tard."},
+                status_code=503,
+                headers={"Retry-After": "30"},
+            )
+
+        if head_sha and reviews is not None:
+            reviews.pending_sha[key] = head_sha
+            previous = reviews.inflight.get(key)
+            if previous is not None:
+                previous.cancel()  # revue d'un commit désormais obsolète
+
+        return ack
+
+    # Starlette nu : ni validation Pydantic, ni injection de dépendances, ni OpenAPI
+    return Starlette(
+        routes=[
+            Route("/health", health, methods=["GET"]),
+            Route("/webhook/github", github_webhook, methods=["POST"]),
+        ],
+        lifespan=lifespan,
+    )
 
 
-async def _run_review_bg(repo: str, pr_number: int, branch: str) -> None:
-    """Exécute la revue en tâche de fond."""
+async def _run_review_bg(
+    state: _ReviewState, orchestrator: Orchestrator, repo: str, pr_number: int, branch: str
+) -> None:
+    """Exécute la revue en tâche de fond (au plus ``state.max`` en parallèle)."""
+    async with state.admission:
+        await state.admission.wait_for(lambda: state.active < state.max)
+        state.active += 1
     try:
-        orchestrator = Orchestrator()
         report = await orchestrator.review_pr(repo, pr_number, branch)
         logger.info(
-            f"Revue terminée : {repo}#{pr_number} → "
-            f"{report.verdict.verdict.value} ({report.verdict.confidence_score}/100)"
+            "Revue terminée : %s#%d → %s (%d/100)",
+            repo, pr_number,
+            report.verdict.verdict.value, report.verdict.confidence_score,
         )
     except Exception as exc:
-        logger.error(f"Erreur revue {repo}#{pr_number} : {exc}", exc_info=True)
+        logger.error("Erreur revue %s#%d : %s", repo, pr_number, exc, exc_info=True)
+    finally:
+        async with state.admission:
+            state.active -= 1
+            state.admission.notify(1)
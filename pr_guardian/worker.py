@@ -0,0 +1,180 @@
+"""
+Worker de revue — PR-Guardian Orchestrator.
+
+Consomme la file Redis alimentée par le serveur webhook (REVIEW_QUEUE=redis)
+et exécute les revues dans un processus séparé : le serveur ne fait plus
+qu'accuser réception, et les workers se scalent indépendamment.
+
+Usage : python -m pr_guardian.worker [--concurrency 4]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sys
+from typing import Any
+
+import click
+
+from pr_guardian.config import get_settings
+from pr_guardian.orchestrator import Orchestrator
+from pr_guardian.utils.cpu_pool import shutdown_cpu_pool
+from pr_guardian.utils.logger import setup_logging
+
+logger = logging.getLogger("pr_guardian.worker")
+
+_QUEUE_KEY = "pr_guardian:reviews"
+_LATEST_KEY = "pr_guardian:latest_sha:{}"
+# Au-delà, un commit ni revu ni relancé est présumé perdu (worker tué en
+# pleine revue) : GitHub peut alors le remettre en file. Une clé expirée ne
+# fait jamais sauter une revue encore en file (cf. is_superseded).
+_LATEST_TTL = 3600
+_RETRY_DELAY = 5.0  # secondes, après une erreur de lecture de la file
+
+# Comparer-puis-supprimer atomique : un GET suivi d'un DEL effacerait le
+# commit d'un push arrivé entre les deux.
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisReviewQueue:
+    """
+    File de revues partagée entre le serveur webhook et les workers.
+
+    Les éléments sont des JSON {repo, pr, branch, sha} (RPUSH / BLPOP). Le
+    dernier commit connu de chaque PR est tenu dans une clé à TTL, pour que
+    les workers sautent les revues devenues obsolètes.
+    """
+
+    def __init__(self, redis: Any, maxsize: int = 0):
+        self._redis = redis
+        self._maxsize = maxsize
+
+    @staticmethod
+    def _latest(repo: str, pr_number: int) -> str:
+        return _LATEST_KEY.format(f"{repo}#{pr_number}")
+
+    async def put(self, repo: str, pr_number: int, branch: str, head_sha: str) -> None:
+        """Ajoute une revue ; lève asyncio.QueueFull si la file est pleine ou indisponible."""
+        item = json.dumps({"repo": repo, "pr": pr_number, "branch": branch, "sha": head_sha})
+        try:
+            if self._maxsize and await self._redis.llen(_QUEUE_KEY) >= self._maxsize:
+                raise asyncio.QueueFull
+            # MULTI : jamais de dernier commit enregistré sans l'élément en file
+            async with self._redis.pipeline(transaction=True) as pipe:
+                if head_sha:
+                    pipe.set(self._latest(repo, pr_number), head_sha, ex=_LATEST_TTL)
+                pipe.rpush(_QUEUE_KEY, item)
+                await pipe.execute()
+        except asyncio.QueueFull:
+            raise
+        except Exception as exc:
+            logger.error("File Redis indisponible : %s", exc)
+            raise asyncio.QueueFull from exc
+
+    async def is_pending(self, repo: str, pr_number: int, head_sha: str) -> bool:
+        """True si ce commit est déjà en file ou en cours de revue."""
+        latest = await self._redis.get(self._latest(repo, pr_number))
+        return latest is not None and latest.decode() == head_sha
+
+    async def is_superseded(self, repo: str, pr_number: int, head_sha: str) -> bool:
+        """True si un push plus récent a remplacé ce commit (clé absente : à revoir)."""
+        latest = await self._redis.get(self._latest(repo, pr_number))
+        return latest is not None and latest.decode() != head_sha
+
+    async def get(self) -> tuple[str, int, str, str]:
+        """Attend et retire la prochaine revue (les éléments mal formés sont ignorés)."""
+        while True:
+            _, raw = await self._redis.blpop([_QUEUE_KEY])
+            try:
+                item = json.loads(raw)
+                return item["repo"], int(item["pr"]), item.get("branch", ""), item.get("sha", "")
+            except (ValueError, KeyError, TypeError) as exc:
+                logger.warning("Élément de file invalide ignoré (%r) : %s", raw[:200], exc)
+
+    async def done(self, repo: str, pr_number: int, head_sha: str) -> None:
+        """Oublie le commit une fois sa revue terminée (s'il est toujours le dernier)."""
+        if head_sha:
+            await self._redis.eval(_RELEASE_SCRIPT, 1, self._latest(repo, pr_number), head_sha)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def connect_review_queue(url: str, maxsize: int = 0) -> RedisReviewQueue:
+    """Ouvre la file Redis (nécessite le paquet redis)."""
+    from redis.asyncio import Redis
+
+    return RedisReviewQueue(Redis.from_url(url), maxsize)
+
+
+async def _consume(queue: RedisReviewQueue, orchestrator: Orchestrator) -> None:
+    """Boucle d'un worker : une revue à la fois."""
+    while True:
+        try:
+            repo, pr_number, branch, head_sha = await queue.get()
+        except Exception as exc:
+            logger.error("Lecture de la file impossible : %s", exc)
+            await asyncio.sleep(_RETRY_DELAY)
+            continue
+        try:
+            if head_sha and await queue.is_superseded(repo, pr_number, head_sha):
+                logger.info("Revue %s#%d (%s) remplacée par un push plus récent",
+                            repo, pr_number, head_sha[:7])
+                continue
+            report = await orchestrator.review_pr(repo, pr_number, branch)
+            logger.info(
+                "Revue terminée : %s#%d → %s (%d/100)",
+                repo, pr_number,
+                report.verdict.verdict.value, report.verdict.confidence_score,
+            )
+        except Exception as exc:
+            logger.error("Erreur revue %s#%d : %s", repo, pr_number, exc, exc_info=True)
+        finally:
+            try:
+                await queue.done(repo, pr_number, head_sha)
+            except Exception as exc:
+                logger.warning("Redis indisponible (%s)", exc)
+
+
+async def run_worker(concurrency: int) -> None:
+    """Lance `concurrency` consommateurs sur la file Redis."""
+    settings = get_settings()
+    queue = connect_review_queue(settings.redis_url)
+    orchestrator = Orchestrator()
+    logger.info("Worker démarré (%d revues en parallèle)", concurrency)
+    try:
+        await asyncio.gather(*(_consume(queue, orchestrator) for _ in range(concurrency)))
+    finally:
+        await queue.close()
+        orchestrator.close()
+        shutdown_cpu_pool()
+
+
+@click.command()
+@click.option("--concurrency", "-c", type=int, default=None,
+              help="Revues en parallèle (défaut : MAX_CONCURRENT_REVIEWS)")
+def main(concurrency: int | None) -> None:
+    """🛡️ PR-Guardian Worker — exécute les revues mises en file par le webhook."""
+    setup_logging()
+    settings = get_settings()
+    if not settings.redis_url:
+        click.echo("REDIS_URL requis pour le worker.", err=True)
+        sys.exit(1)
+    try:
+        asyncio.run(run_worker(concurrency or settings.max_concurrent_reviews))
+    except ImportError:
+        click.echo("redis requis pour le worker : pip install redis", err=True)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -17,55 +17,61 @@ Usage :
 
 from __future__ import annotations
 
-import asyncio
-import json
+import hashlib
 import sys
 from datetime import UTC, datetime
+from functools import cache
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import TYPE_CHECKING
 
-import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
+import click  # eager : les décorateurs @click.command / @click.option s'exécutent à l'import
+
+try:  # orjson (optionnel) : sérialisation JSON plus rapide
+    import orjson
+except ImportError:
+    orjson = None
 
 # Ajouter le projet au path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
-from pr_guardian.models import (
-    AcceptanceCriterion,
-    CheckStatus,
-    CodeAnalysisResult,
-    FigmaCheckResult,
-    FigmaMapping,
-    FigmaRequirement,
-    FinalReport,
-    JiraValidationResult,
-    JudgeVerdict,
-    ModifiedFile,
-    MustFixItem,
-    PRContext,
-    Severity,
-    UMLCheckResult,
-    UMLDiagram,
-    UMLEntity,
-    UMLMismatch,
-    UMLRelation,
-    ValidationRow,
-    Verdict,
-)
-from pr_guardian.agents.judge import JudgeAgent
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+# Modèles, agents et rendus Rich sont importés dans les fonctions qui les
+# utilisent : `--help` ne paie que l'import de click.
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from pr_guardian.models import (
+        CheckStatus,
+        CodeAnalysisResult,
+        FigmaCheckResult,
+        JiraValidationResult,
+        JudgeVerdict,
+        PRContext,
+        UMLCheckResult,
+        ValidationRow,
+        Verdict,
+    )
+
 
-console = Console()
+@cache
+def _console() -> Console:
+    """Console Rich partagée, créée au premier affichage."""
+    from rich.console import Console
+
+    return Console()
 
 
 # ════════════════════════════════════════════
 #  DONNÉES FICTIVES (Scénarios)
 # ════════════════════════════════════════════
+# Fabriques mises en cache : les modèles sont construits une seule fois et
+# partagés entre scénarios (--scenario all), la simulation ne les modifie pas.
 
+@cache
 def make_pr_context() -> PRContext:
     """Crée un contexte PR réaliste fictif."""
+    from pr_guardian.models import PRContext
+
     return PRContext(
         repo="Team7/e-commerce-app",
         pr_number=42,
@@ -92,8 +98,11 @@ def make_pr_context() -> PRContext:
     )
 
 
+@cache
 def make_code_analysis_pass() -> CodeAnalysisResult:
     """Agent 1 — Résultat PASS."""
+    from pr_guardian.models import CodeAnalysisResult, ModifiedFile
+
     return CodeAnalysisResult(
         summary="PR bien structurée : 6 fichiers modifiés, 2 endpoints REST, tests couverts.",
         files_modified=[
@@ -116,8 +125,11 @@ def make_code_analysis_pass() -> CodeAnalysisResult:
     )
 
 
+@cache
 def make_code_analysis_fail() -> CodeAnalysisResult:
     """Agent 1 — Résultat sans tests."""
+    from pr_guardian.models import CodeAnalysisResult, ModifiedFile
+
     return CodeAnalysisResult(
         summary="PR avec 4 fichiers modifiés, 2 endpoints REST, AUCUN test ajouté.",
         files_modified=[
@@ -138,8 +150,11 @@ def make_code_analysis_fail() -> CodeAnalysisResult:
     )
 
 
+@cache
 def make_uml_check_pass() -> UMLCheckResult:
     """Agent 2 — UML cohérent."""
+    from pr_guardian.models import CheckStatus, UMLCheckResult, UMLDiagram, UMLEntity, UMLRelation
+
     return UMLCheckResult(
         diagrams_found=[
             UMLDiagram(
@@ -162,8 +177,18 @@ def make_uml_check_pass() -> UMLCheckResult:
     )
 
 
+@cache
 def make_uml_check_fail() -> UMLCheckResult:
     """Agent 2 — UML avec mismatch."""
+    from pr_guardian.models import (
+        CheckStatus,
+        Severity,
+        UMLCheckResult,
+        UMLDiagram,
+        UMLEntity,
+        UMLMismatch,
+    )
+
     return UMLCheckResult(
         diagrams_found=[
             UMLDiagram(
@@ -197,8 +222,11 @@ def make_uml_check_fail() -> UMLCheckResult:
     )
 
 
+@cache
 def make_figma_check_pass() -> FigmaCheckResult:
     """Agent 3 — Figma conforme."""
+    from pr_guardian.models import CheckStatus, FigmaCheckResult, FigmaMapping, FigmaRequirement
+
     return FigmaCheckResult(
         figma_link="https://www.figma.com/file/ABC123/LoginPage",
         pages_analyzed=["Login", "OAuth Flow"],
@@ -229,8 +257,11 @@ def make_figma_check_pass() -> FigmaCheckResult:
     )
 
 
+@cache
 def make_figma_check_fail() -> FigmaCheckResult:
     """Agent 3 — Figma avec écarts."""
+    from pr_guardian.models import CheckStatus, FigmaCheckResult, FigmaMapping, FigmaRequirement
+
     return FigmaCheckResult(
         figma_link="https://www.figma.com/file/ABC123/LoginPage",
         pages_analyzed=["Login"],
@@ -259,8 +290,11 @@ def make_figma_check_fail() -> FigmaCheckResult:
     )
 
 
+@cache
 def make_jira_validation_pass() -> JiraValidationResult:
     """Agent 4 — Jira OK."""
+    from pr_guardian.models import AcceptanceCriterion, CheckStatus, JiraValidationResult, Verdict
+
     return JiraValidationResult(
         jira_key="PROJ-42",
         jira_summary="Implémenter la page de connexion avec OAuth2",
@@ -288,8 +322,11 @@ def make_jira_validation_pass() -> JiraValidationResult:
     )
 
 
+@cache
 def make_jira_validation_fail() -> JiraValidationResult:
     """Agent 4 — Jira avec AC en échec."""
+    from pr_guardian.models import AcceptanceCriterion, CheckStatus, JiraValidationResult, Verdict
+
     return JiraValidationResult(
         jira_key="PROJ-42",
         jira_summary="Implémenter la page de connexion avec OAuth2",
@@ -346,11 +383,39 @@ SCENARIOS = {
 }
 
 
+@cache
+def _status_styles() -> dict[CheckStatus, str]:
+    """Rendu Rich des statuts dans la table de validation (un libellé par membre)."""
+    from pr_guardian.models import CheckStatus
+
+    return {
+        CheckStatus.OK: "[green]✅ OK[/]", CheckStatus.PASS: "[green]✅ PASS[/]",
+        CheckStatus.FAIL: "[red]❌ FAIL[/]", CheckStatus.MISMATCH: "[red]❌ MISMATCH[/]",
+        CheckStatus.BLOCKED: "[yellow]🚫 BLOCKED[/]", CheckStatus.PARTIAL: "[yellow]⚠️ PARTIAL[/]",
+        CheckStatus.NOT_APPLICABLE: CheckStatus.NOT_APPLICABLE.value,
+    }
+
+
+@cache
+def _verdict_styles() -> dict[Verdict, tuple[str, str]]:
+    """Couleur Rich et emoji de chaque verdict."""
+    from pr_guardian.models import Verdict
+
+    return {
+        Verdict.PASS: ("green", "✅"),
+        Verdict.FAIL: ("red", "❌"),
+        Verdict.BLOCKED: ("yellow", "🚫"),
+    }
+
+
 # ════════════════════════════════════════════
 #  SIMULATION
 # ════════════════════════════════════════════
 
 def display_header(scenario_name: str, scenario_desc: str):
+    from rich.panel import Panel
+
+    console = _console()
     console.print()
     console.print(Panel(
         f"[bold cyan]🧪 SIMULATION LOCALE DU PIPELINE PR-GUARDIAN[/]\n\n"
@@ -364,11 +429,11 @@ def display_header(scenario_name: str, scenario_desc: str):
 
 
 def display_step(step: str, description: str, status: str = "⏳"):
-    console.print(f"  {status} [bold]{step}[/] — {description}")
+    _console().print(f"  {status} [bold]{step}[/] — {description}")
 
 
 def display_agent_result(agent_name: str, score: str, status_emoji: str):
-    console.print(f"    {status_emoji} {agent_name:<30} {score}")
+    _console().print(f"    {status_emoji} {agent_name:<30} {score}")
 
 
 def build_validation_table(
@@ -376,50 +441,61 @@ def build_validation_table(
     uml: UMLCheckResult | None,
     figma: FigmaCheckResult | None,
 ) -> list[ValidationRow]:
-    """Construit la table de validation à partir des résultats des agents."""
+    """
+    Construit la table de validation à partir des résultats des agents.
+
+    Les champs viennent de modèles déjà validés : model_construct évite de
+    revalider chaque ligne.
+    """
+    from pr_guardian.models import CheckStatus, ValidationRow
+
     rows: list[ValidationRow] = []
 
     if jira:
         for ac in jira.acceptance_criteria:
-            rows.append(ValidationRow(
+            rows.append(ValidationRow.model_construct(
                 category="Jira AC", item=f"[{ac.id}] {ac.description[:50]}",
                 status=ac.status, evidence=ac.evidence[:60],
             ))
         for dod in jira.definition_of_done:
-            rows.append(ValidationRow(
+            rows.append(ValidationRow.model_construct(
                 category="Jira DoD", item=f"[{dod.id}] {dod.description[:50]}",
                 status=dod.status, evidence=dod.evidence[:60],
             ))
     else:
-        rows.append(ValidationRow(category="Jira", item="Non disponible", status=CheckStatus.BLOCKED))
+        rows.append(ValidationRow.model_construct(category="Jira", item="Non disponible", status=CheckStatus.BLOCKED))
 
     if uml:
         if uml.mismatches:
             for m in uml.mismatches:
-                rows.append(ValidationRow(
+                rows.append(ValidationRow.model_construct(
                     category="UML", item=f"{m.element}: {m.issue[:40]}",
                     status=CheckStatus.FAIL, evidence=m.suggestion[:60],
                 ))
         else:
-            rows.append(ValidationRow(category="UML", item="Diagramme cohérent", status=CheckStatus.OK,
-                                       evidence=uml.summary[:60]))
+            rows.append(ValidationRow.model_construct(
+                category="UML", item="Diagramme cohérent",
+                status=CheckStatus.OK, evidence=uml.summary[:60],
+            ))
     else:
-        rows.append(ValidationRow(category="UML", item="Non disponible", status=CheckStatus.BLOCKED))
+        rows.append(ValidationRow.model_construct(category="UML", item="Non disponible", status=CheckStatus.BLOCKED))
 
     if figma:
         for m in figma.mappings:
-            rows.append(ValidationRow(
+            rows.append(ValidationRow.model_construct(
                 category="Figma", item=m.requirement.frame_name,
                 status=m.implementation_status, evidence=(m.evidence or m.gap)[:60],
             ))
     else:
-        rows.append(ValidationRow(category="Figma", item="Non disponible", status=CheckStatus.BLOCKED))
+        rows.append(ValidationRow.model_construct(category="Figma", item="Non disponible", status=CheckStatus.BLOCKED))
 
     return rows
 
 
 def format_pr_comment(verdict: JudgeVerdict, validation_table: list[ValidationRow]) -> str:
     """Génère le commentaire PR formaté (comme en production)."""
+    from pr_guardian.models import Verdict
+
     v = verdict
     emoji = "✅" if v.verdict == Verdict.PASS else ("❌" if v.verdict == Verdict.FAIL else "🚫")
 
@@ -428,8 +504,7 @@ def format_pr_comment(verdict: JudgeVerdict, validation_table: list[ValidationRo
         "",
         "### Justification",
     ]
-    for j in v.justification:
-        lines.append(f"- {j}")
+    lines.extend([f"- {j}" for j in v.justification])
     lines.append("")
 
     if v.must_fix:
@@ -442,22 +517,44 @@ def format_pr_comment(verdict: JudgeVerdict, validation_table: list[ValidationRo
                 lines.append(f"  💡 {mf.suggestion}")
         lines.append("")
 
-    lines.append("### Table de validation")
-    lines.append("| Catégorie | Item | Statut | Preuve |")
-    lines.append("|-----------|------|--------|--------|")
-    for row in validation_table:
-        lines.append(f"| {row.category} | {row.item} | {row.status.value} | {row.evidence} |")
-
-    lines.append("")
-    lines.append("---")
-    lines.append("*PR-Guardian Orchestrator — Team7*")
+    lines.extend((
+        "### Table de validation",
+        "| Catégorie | Item | Statut | Preuve |",
+        "|-----------|------|--------|--------|",
+    ))
+    lines.extend([
+        f"| {row.category} | {row.item} | {row.status.value} | {row.evidence} |"
+        for row in validation_table
+    ])
+    lines.extend(("", "---", "*PR-Guardian Orchestrator — Team7*"))
 
     return "\n".join(lines)
 
 
-async def run_simulation(scenario_name: str):
+def _scenario_fingerprint(scenario_name: str) -> str:
+    """
+    Empreinte des entrées d'un scénario : ce script (fixtures) et le code qui
+    produit le rapport (modèles, verdict heuristique).
+    """
+    h = hashlib.blake2b(scenario_name.encode("utf-8"), digest_size=8)
+    for path in (
+        Path(__file__).resolve(),
+        _PROJECT_ROOT / "pr_guardian" / "models.py",
+        _PROJECT_ROOT / "pr_guardian" / "agents" / "judge.py",
+    ):
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def run_simulation(scenario_name: str):
     """Exécute la simulation complète d'un scénario."""
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from pr_guardian.agents.judge import JudgeAgent
+    from pr_guardian.models import CheckStatus, FinalReport, Verdict
 
+    console = _console()
     scenario = SCENARIOS[scenario_name]
     display_header(scenario_name, scenario["description"])
 
@@ -565,8 +662,7 @@ async def run_simulation(scenario_name: str):
         code_analysis, uml_check, figma_check, jira_validation
     )
 
-    verdict_color = {"PASS": "green", "FAIL": "red", "BLOCKED": "yellow"}[verdict.verdict.value]
-    verdict_emoji = {"PASS": "✅", "FAIL": "❌", "BLOCKED": "🚫"}[verdict.verdict.value]
+    verdict_color, verdict_emoji = _verdict_styles()[verdict.verdict]
 
     console.print(f"    Verdict    : [{verdict_color}][bold]{verdict_emoji} {verdict.verdict.value}[/][/]")
     console.print(f"    Confiance  : [{verdict_color}]{verdict.confidence_score}/100[/]")
@@ -600,12 +696,9 @@ async def run_simulation(scenario_name: str):
     table.add_column("Statut", justify="center", width=10)
     table.add_column("Preuve", width=60)
 
+    status_styles = _status_styles()
     for row in validation_table:
-        status_style = {
-            "OK": "[green]✅ OK[/]", "PASS": "[green]✅ PASS[/]",
-            "FAIL": "[red]❌ FAIL[/]", "MISMATCH": "[red]❌ MISMATCH[/]",
-            "BLOCKED": "[yellow]🚫 BLOCKED[/]", "PARTIAL": "[yellow]⚠️ PARTIAL[/]",
-        }.get(row.status.value, row.status.value)
+        status_style = status_styles[row.status]
         table.add_row(row.category, row.item, status_style, row.evidence)
 
     console.print(table)
@@ -636,17 +729,6 @@ async def run_simulation(scenario_name: str):
     ))
     console.print()
 
-    # ── JSON output ──
-    report = FinalReport(
-        pr_context=context,
-        verdict=verdict,
-        validation_table=validation_table,
-        code_analysis=code_analysis,
-        uml_check=uml_check,
-        figma_check=figma_check,
-        jira_validation=jira_validation,
-    )
-
     # ── Verdict final ──
     console.print(Panel(
         f"[bold {verdict_color}]{verdict_emoji}  VERDICT FINAL : {verdict.verdict.value}[/]\n"
@@ -658,9 +740,35 @@ async def run_simulation(scenario_name: str):
     ))
     console.print()
 
-    # Save JSON report
-    output_path = Path(__file__).parent.parent / f"simulation_report_{scenario_name}.json"
-    output_path.write_text(report.model_dump_json(indent=2), encoding="utf-8")
+    # ── JSON output ──
+    output_path = _PROJECT_ROOT / f"simulation_report_{scenario_name}.json"
+    fingerprint_path = output_path.with_suffix(".fingerprint")
+    fingerprint = _scenario_fingerprint(scenario_name)
+    if (
+        output_path.exists()
+        and fingerprint_path.exists()
+        and fingerprint_path.read_text(encoding="utf-8").strip() == fingerprint
+    ):
+        console.print(f"  💾 Rapport JSON inchangé : [cyan]{output_path}[/]")
+        console.print()
+        return
+
+    report = FinalReport(
+        pr_context=context,
+        verdict=verdict,
+        validation_table=validation_table,
+        code_analysis=code_analysis,
+        uml_check=uml_check,
+        figma_check=figma_check,
+        jira_validation=jira_validation,
+    )
+    if orjson is not None:
+        # mode="json" convertit déjà enums et datetimes en types JSON natifs
+        data = orjson.dumps(report.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+    else:
+        data = report.model_dump_json(indent=2).encode("utf-8")
+    output_path.write_bytes(data)
+    fingerprint_path.write_text(fingerprint, encoding="utf-8")
     console.print(f"  💾 Rapport JSON sauvegardé : [cyan]{output_path}[/]")
     console.print()
 
@@ -678,13 +786,18 @@ async def run_simulation(scenario_name: str):
 )
 def main(scenario: str):
     """🧪 Simule le pipeline PR-Guardian en local sans API."""
+    console = _console()
+    # `with console` met la sortie en tampon : une seule écriture sur stdout
+    # par scénario au lieu d'un flush par console.print
     if scenario == "all":
         for s in ["pass", "fail", "blocked"]:
-            asyncio.run(run_simulation(s))
-            console.print("━" * 80)
-            console.print()
+            with console:
+                run_simulation(s)
+                console.print("━" * 80)
+                console.print()
     else:
-        asyncio.run(run_simulation(scenario))
+        with console:
+            run_simulation(scenario)
 
 
 if __name__ == "__main__":
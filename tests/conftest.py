@@ -2,8 +2,13 @@
 Fixtures pytest — PR-Guardian.
 """
 
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
 import pytest
 
+from pr_guardian.config import Settings
+
 from pr_guardian.models import (
     AcceptanceCriterion,
     CheckStatus,
@@ -24,11 +29,59 @@ from pr_guardian.models import (
     UMLRelation,
     Verdict,
 )
+from pr_guardian.parsers.plantuml_parser import PlantUMLParser
 
 
-@pytest.fixture
+# ── Environnement de test ───────────────────
+
+@pytest.fixture(scope="session", autouse=True)
+def _disable_llm() -> Iterator[None]:
+    """Désactive le LLM pour toute la session : aucun test n'appelle Cohere."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Settings, "llm_configured", property(lambda self: False))
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _no_cpu_pool() -> Iterator[None]:
+    """Parsing CPU en thread (CPU_WORKERS=0) : aucun pool de processus en test."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("CPU_WORKERS", "0")
+        yield
+
+
+# Échantillons partagés par toute la session : un test qui a besoin d'une
+# variante passe par model_copy(update={...}), jamais par affectation.
+_SHARED_SAMPLES = (
+    "sample_pr_context",
+    "sample_code_analysis",
+    "sample_uml_check",
+    "sample_figma_check",
+    "sample_jira_validation",
+    "sample_judge_verdict_pass",
+    "sample_judge_verdict_fail",
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _shared_samples_unchanged(request: pytest.FixtureRequest) -> Iterator[None]:
+    """Échoue en fin de session si un test a modifié un échantillon partagé."""
+    samples = {name: request.getfixturevalue(name) for name in _SHARED_SAMPLES}
+    before = {name: sample.model_dump() for name, sample in samples.items()}
+    yield
+    changed = [name for name, sample in samples.items() if sample.model_dump() != before[name]]
+    assert not changed, f"Échantillons de session modifiés par un test : {changed}"
+
+
+# ── Échantillons ────────────────────────────
+
+@pytest.fixture(scope="session")
 def sample_pr_context() -> PRContext:
-    """Contexte PR de test."""
+    """
+    Contexte PR de test, partagé par la session : à ne pas modifier.
+
+    Pour une variante, utiliser `sample_pr_context.model_copy(update={...})`.
+    """
     return PRContext(
         repo="Team7/mon-projet",
         pr_number=42,
@@ -44,6 +97,12 @@ def sample_pr_context() -> PRContext:
 
 
 @pytest.fixture
+def mutable_pr_context(sample_pr_context: PRContext) -> PRContext:
+    """Copie du contexte PR, pour les tests où le code sous test le modifie."""
+    return sample_pr_context.model_copy(deep=True)
+
+
+@pytest.fixture(scope="session")
 def sample_code_analysis() -> CodeAnalysisResult:
     """Résultat d'analyse de code de test."""
     return CodeAnalysisResult(
@@ -82,7 +141,7 @@ def sample_code_analysis() -> CodeAnalysisResult:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_uml_check() -> UMLCheckResult:
     """Résultat de vérification UML de test."""
     return UMLCheckResult(
@@ -105,7 +164,7 @@ def sample_uml_check() -> UMLCheckResult:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_figma_check() -> FigmaCheckResult:
     """Résultat de vérification Figma de test."""
     return FigmaCheckResult(
@@ -137,7 +196,7 @@ def sample_figma_check() -> FigmaCheckResult:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_jira_validation() -> JiraValidationResult:
     """Résultat de validation Jira de test."""
     return JiraValidationResult(
@@ -173,7 +232,7 @@ def sample_jira_validation() -> JiraValidationResult:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_judge_verdict_pass() -> JudgeVerdict:
     """Verdict PASS de test."""
     return JudgeVerdict(
@@ -189,7 +248,7 @@ def sample_judge_verdict_pass() -> JudgeVerdict:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_judge_verdict_fail() -> JudgeVerdict:
     """Verdict FAIL de test."""
     return JudgeVerdict(
@@ -217,7 +276,7 @@ def sample_judge_verdict_fail() -> JudgeVerdict:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_puml_content() -> str:
     """Contenu PlantUML de test."""
     return """
@@ -250,7 +309,13 @@ SignupController --> AuthService : delegates
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def parsed_sample_puml(sample_puml_content: str) -> UMLDiagram:
+    """Diagramme issu de sample_puml_content, parsé une seule fois (lecture seule)."""
+    return PlantUMLParser.parse(sample_puml_content, "test.puml")
+
+
+@pytest.fixture(scope="session")
 def sample_diff_patch() -> str:
     """Patch Git de test."""
     return """
@@ -281,3 +346,67 @@ def sample_diff_patch() -> str:
 +    email: str
 +    password: str
 """
+
+
+@pytest.fixture(scope="session")
+def judge_samples(
+    sample_pr_context: PRContext,
+    sample_code_analysis: CodeAnalysisResult,
+    sample_uml_check: UMLCheckResult,
+    sample_figma_check: FigmaCheckResult,
+    sample_jira_validation: JiraValidationResult,
+) -> tuple[PRContext, CodeAnalysisResult, UMLCheckResult, FigmaCheckResult, JiraValidationResult]:
+    """Entrées du Judge (contexte + résultats des 4 agents), dans l'ordre de ses signatures."""
+    return (
+        sample_pr_context,
+        sample_code_analysis,
+        sample_uml_check,
+        sample_figma_check,
+        sample_jira_validation,
+    )
+
+
+# ── Factories ───────────────────────────────
+
+@pytest.fixture(scope="session")
+def modified_file_factory() -> Callable[..., ModifiedFile]:
+    """Fabrique de ModifiedFile : le test ne précise que les champs qui diffèrent."""
+    defaults = {"filename": "src/main.py", "status": "modified", "additions": 0, "deletions": 0}
+
+    def _make(**overrides: Any) -> ModifiedFile:
+        return ModifiedFile(**{**defaults, **overrides})
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def code_analysis_factory(
+    modified_file_factory: Callable[..., ModifiedFile],
+) -> Callable[..., CodeAnalysisResult]:
+    """Fabrique de CodeAnalysisResult (un fichier modifié, aucun test par défaut)."""
+
+    def _make(**overrides: Any) -> CodeAnalysisResult:
+        overrides.setdefault("files_modified", [modified_file_factory()])
+        return CodeAnalysisResult(**overrides)
+
+    return _make
+
+
+# ── Clients factices ────────────────────────
+
+@pytest.fixture(scope="session")
+def stub_client() -> Callable[..., SimpleNamespace]:
+    """
+    Client factice léger (GitHub, Figma, Jira) : chaque argument nommé devient
+    une méthode qui ignore ses arguments et renvoie la valeur donnée.
+
+    À préférer à MagicMock quand le test n'inspecte pas les appels.
+    """
+
+    def _method(value: Any) -> Callable[..., Any]:
+        return lambda *args, **kwargs: value
+
+    def _make(**returns: Any) -> SimpleNamespace:
+        return SimpleNamespace(**{name: _method(value) for name, value in returns.items()})
+
+    return _make
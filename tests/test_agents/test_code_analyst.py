@@ -1,35 +1,13 @@
 """Tests de l'Agent 1 — Code Analyst."""
 
 import pytest
-from unittest.mock import MagicMock
 
 from pr_guardian.agents.code_analyst import CodeAnalystAgent
 from pr_guardian.models import ModifiedFile
 
 
-def _make_agent_no_llm(**kwargs):
-    """Create a CodeAnalystAgent with LLM disabled."""
-    agent = CodeAnalystAgent(**kwargs)
-    mock_settings = MagicMock()
-    mock_settings.llm_configured = False
-    agent._settings = mock_settings
-    return agent
-
-
-class TestCodeAnalystAgent:
-    """Tests pour CodeAnalystAgent."""
-
-    @pytest.mark.asyncio
-    async def test_run_extracts_features(self, sample_pr_context):
-        """Vérifie l'extraction des fonctionnalités depuis le diff."""
-        mock_gh = MagicMock()
-        mock_gh.get_modified_files.return_value = [
-            ModifiedFile(
-                filename="src/auth/login.py",
-                status="added",
-                additions=50,
-                deletions=0,
-                patch="""
+# Patch d'un nouveau module de login (endpoint + classe + méthode)
+_LOGIN_PATCH = """
 @@ -0,0 +1,10 @@
 +from fastapi import APIRouter
 +router = APIRouter()
@@ -41,11 +19,37 @@ class TestCodeAnalystAgent:
 +class LoginController:
 +    def authenticate(self):
 +        pass
-""",
-            ),
-        ]
+"""
+
+# Fichiers sans patch, validés une fois au chargement du module. L'agent n'y
+# modifie que `language`, déduit du nom de fichier : le partage est sans effet.
+_MAIN_SRC = ModifiedFile(filename="src/main.py", status="modified", additions=10, deletions=5)
+_TEST_MAIN = ModifiedFile(filename="tests/test_main.py", status="added", additions=20)
+_PASSWORD_MANAGER = ModifiedFile(
+    filename="src/auth/password_manager.py", status="modified", additions=10, deletions=5
+)
+_HELPERS = ModifiedFile(filename="src/utils/helpers.py", status="modified", additions=5, deletions=2)
+
+
+class TestCodeAnalystAgent:
+    """Tests pour CodeAnalystAgent."""
+
+    @pytest.mark.asyncio
+    async def test_run_extracts_features(self, stub_client, sample_pr_context):
+        """Vérifie l'extraction des fonctionnalités depuis le diff."""
+        mock_gh = stub_client(
+            get_modified_files=[
+                ModifiedFile(
+                    filename="src/auth/login.py",
+                    status="added",
+                    additions=50,
+                    deletions=0,
+                    patch=_LOGIN_PATCH,
+                ),
+            ],
+        )
 
-        agent = _make_agent_no_llm(github_client=mock_gh)
+        agent = CodeAnalystAgent(github_client=mock_gh)
         result = await agent.run(sample_pr_context)
 
         assert len(result.files_modified) == 1
@@ -54,30 +58,32 @@ class TestCodeAnalystAgent:
         assert "authenticate" in result.methods_touched
 
     @pytest.mark.asyncio
-    async def test_run_detects_tests(self, sample_pr_context):
+    async def test_run_detects_tests(self, stub_client, sample_pr_context):
         """Vérifie la détection des fichiers de test."""
-        mock_gh = MagicMock()
-        mock_gh.get_modified_files.return_value = [
-            ModifiedFile(filename="src/main.py", status="modified", additions=10, deletions=5, patch=""),
-            ModifiedFile(filename="tests/test_main.py", status="added", additions=20, deletions=0, patch=""),
-        ]
+        mock_gh = stub_client(
+            get_modified_files=[
+                _MAIN_SRC,
+                _TEST_MAIN,
+            ],
+        )
 
-        agent = _make_agent_no_llm(github_client=mock_gh)
+        agent = CodeAnalystAgent(github_client=mock_gh)
         result = await agent.run(sample_pr_context)
 
         assert "tests/test_main.py" in result.tests_added
         assert "tests/test_main.py" not in result.tests_modified
 
     @pytest.mark.asyncio
-    async def test_run_detects_sensitive_files(self, sample_pr_context):
+    async def test_run_detects_sensitive_files(self, stub_client, sample_pr_context):
         """Vérifie la détection des fichiers sensibles."""
-        mock_gh = MagicMock()
-        mock_gh.get_modified_files.return_value = [
-            ModifiedFile(filename="src/auth/password_manager.py", status="modified", additions=10, deletions=5, patch=""),
-            ModifiedFile(filename="src/utils/helpers.py", status="modified", additions=5, deletions=2, patch=""),
-        ]
+        mock_gh = stub_client(
+            get_modified_files=[
+                _PASSWORD_MANAGER,
+                _HELPERS,
+            ],
+        )
 
-        agent = _make_agent_no_llm(github_client=mock_gh)
+        agent = CodeAnalystAgent(github_client=mock_gh)
         result = await agent.run(sample_pr_context)
 
         assert any("sensible" in s for s in result.sensitive_points)
@@ -91,13 +97,9 @@ class TestCodeAnalystAgent:
         assert "+120" in summary  # additions
         assert "-30" in summary  # deletions
 
-    def test_assess_test_coverage_no_tests(self):
+    def test_assess_test_coverage_no_tests(self, code_analysis_factory):
         """Vérifie l'évaluation de couverture sans tests."""
-        from pr_guardian.models import CodeAnalysisResult, ModifiedFile
-        
-        result = CodeAnalysisResult(
-            files_modified=[ModifiedFile(filename="src/main.py", status="modified")],
-        )
-        
+        result = code_analysis_factory()
+
         coverage = CodeAnalystAgent._assess_test_coverage(result)
         assert "Aucun test" in coverage
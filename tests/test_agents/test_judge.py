@@ -5,42 +5,73 @@ from unittest.mock import MagicMock, patch
 import json
 
 from pr_guardian.agents.judge import JudgeAgent
-from pr_guardian.models import CheckStatus, Severity, Verdict
+from pr_guardian.models import (
+    CheckStatus,
+    JudgeVerdict,
+    Severity,
+    UMLCheckResult,
+    UMLMismatch,
+    Verdict,
+)
+
+
+# ── Réponses LLM sérialisées une fois ──
+
+_VALID_LLM_RESPONSE_JSON = json.dumps({
+    "verdict": "PASS",
+    "confidence_score": 85,
+    "justification": ["Point 1", "Point 2"],
+    "must_fix": [],
+})
+
+_MUST_FIX_LLM_RESPONSE_JSON = json.dumps({
+    "verdict": "FAIL",
+    "confidence_score": 30,
+    "justification": ["Échec AC-1"],
+    "must_fix": [
+        {
+            "description": "AC-1 non implémenté",
+            "location": "src/auth.py",
+            "suggestion": "Ajouter la logique",
+            "severity": "CRITICAL",
+        }
+    ],
+})
+
+
+# ── Résultats partagés par le module (lecture seule) ──
+
+@pytest.fixture(scope="module")
+def heuristic_pass_verdict(judge_samples) -> JudgeVerdict:
+    """Verdict heuristique sur les résultats d'agents « tout vert »."""
+    _, code, uml, figma, jira = judge_samples
+    return JudgeAgent._heuristic_verdict(code, uml, figma, jira)
+
+
+@pytest.fixture(scope="module")
+def evidence_dossier(judge_samples) -> str:
+    """Dossier de preuves construit à partir des fixtures d'exemple."""
+    return JudgeAgent._build_evidence_dossier(*judge_samples)
 
 
 class TestJudgeAgent:
     """Tests pour le JudgeAgent."""
 
-    @pytest.mark.asyncio
-    async def test_heuristic_verdict_pass(
-        self, sample_pr_context, sample_code_analysis, sample_uml_check,
-        sample_figma_check, sample_jira_validation
-    ):
+    def test_heuristic_verdict_pass(self, heuristic_pass_verdict):
         """Vérifie le verdict heuristique PASS."""
-        verdict = JudgeAgent._heuristic_verdict(
-            sample_code_analysis,
-            sample_uml_check,
-            sample_figma_check,
-            sample_jira_validation,
-        )
-
-        assert verdict.verdict == Verdict.PASS
-        assert verdict.confidence_score >= 60
+        assert heuristic_pass_verdict.verdict == Verdict.PASS
+        assert heuristic_pass_verdict.confidence_score >= 60
 
-    @pytest.mark.asyncio
-    async def test_heuristic_verdict_blocked_no_data(self, sample_pr_context):
+    def test_heuristic_verdict_blocked_no_data(self):
         """Vérifie le verdict heuristique BLOCKED sans données."""
         verdict = JudgeAgent._heuristic_verdict(None, None, None, None)
 
         assert verdict.verdict == Verdict.BLOCKED
         assert any("BLOQUÉ" in j for j in verdict.justification)
 
-    @pytest.mark.asyncio
-    async def test_heuristic_verdict_fail_uml_mismatch(
-        self, sample_pr_context, sample_code_analysis, sample_figma_check, sample_jira_validation
-    ):
+    def test_heuristic_verdict_fail_uml_mismatch(self, judge_samples):
         """Vérifie le verdict heuristique FAIL avec UML mismatch."""
-        from pr_guardian.models import UMLCheckResult, UMLMismatch
+        _, code, _, figma, jira = judge_samples
 
         uml_fail = UMLCheckResult(
             status=CheckStatus.MISMATCH,
@@ -54,23 +85,14 @@ class TestJudgeAgent:
             ],
         )
 
-        verdict = JudgeAgent._heuristic_verdict(
-            sample_code_analysis, uml_fail, sample_figma_check, sample_jira_validation
-        )
+        verdict = JudgeAgent._heuristic_verdict(code, uml_fail, figma, jira)
 
         assert verdict.verdict == Verdict.FAIL
         assert len(verdict.must_fix) > 0
 
-    @pytest.mark.asyncio
-    async def test_heuristic_verdict_no_tests_penalty(self, sample_pr_context):
+    def test_heuristic_verdict_no_tests_penalty(self, code_analysis_factory):
         """Vérifie la pénalité pour absence de tests."""
-        from pr_guardian.models import CodeAnalysisResult, ModifiedFile
-
-        code_no_tests = CodeAnalysisResult(
-            files_modified=[ModifiedFile(filename="src/main.py", status="modified")],
-            tests_added=[],
-            tests_modified=[],
-        )
+        code_no_tests = code_analysis_factory(tests_added=[], tests_modified=[])
 
         verdict = JudgeAgent._heuristic_verdict(code_no_tests, None, None, None)
 
@@ -79,14 +101,7 @@ class TestJudgeAgent:
 
     def test_parse_llm_response_valid(self):
         """Vérifie le parsing d'une réponse LLM valide."""
-        raw = json.dumps({
-            "verdict": "PASS",
-            "confidence_score": 85,
-            "justification": ["Point 1", "Point 2"],
-            "must_fix": [],
-        })
-
-        verdict = JudgeAgent._parse_llm_response(raw)
+        verdict = JudgeAgent._parse_llm_response(_VALID_LLM_RESPONSE_JSON)
 
         assert verdict.verdict == Verdict.PASS
         assert verdict.confidence_score == 85
@@ -94,21 +109,7 @@ class TestJudgeAgent:
 
     def test_parse_llm_response_with_must_fix(self):
         """Vérifie le parsing d'une réponse LLM avec must-fix."""
-        raw = json.dumps({
-            "verdict": "FAIL",
-            "confidence_score": 30,
-            "justification": ["Échec AC-1"],
-            "must_fix": [
-                {
-                    "description": "AC-1 non implémenté",
-                    "location": "src/auth.py",
-                    "suggestion": "Ajouter la logique",
-                    "severity": "CRITICAL",
-                }
-            ],
-        })
-
-        verdict = JudgeAgent._parse_llm_response(raw)
+        verdict = JudgeAgent._parse_llm_response(_MUST_FIX_LLM_RESPONSE_JSON)
 
         assert verdict.verdict == Verdict.FAIL
         assert len(verdict.must_fix) == 1
@@ -123,18 +124,9 @@ class TestJudgeAgent:
         assert verdict.verdict == Verdict.BLOCKED
         assert verdict.confidence_score == 0
 
-    def test_build_evidence_dossier(
-        self, sample_pr_context, sample_code_analysis, sample_uml_check,
-        sample_figma_check, sample_jira_validation
-    ):
+    def test_build_evidence_dossier(self, sample_pr_context, evidence_dossier):
         """Vérifie la construction du dossier de preuves."""
-        evidence = JudgeAgent._build_evidence_dossier(
-            sample_pr_context,
-            sample_code_analysis,
-            sample_uml_check,
-            sample_figma_check,
-            sample_jira_validation,
-        )
+        evidence = evidence_dossier
 
         assert "## CONTEXTE PR" in evidence
         assert "## AGENT 1" in evidence
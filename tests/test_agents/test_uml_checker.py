@@ -1,50 +1,54 @@
 """Tests de l'Agent 2 — UML Checker."""
 
+import os
+
 import pytest
-from unittest.mock import MagicMock
 
 from pr_guardian.agents.uml_checker import UMLCheckerAgent
-from pr_guardian.models import CheckStatus, CodeAnalysisResult
-from pr_guardian.parsers.plantuml_parser import PlantUMLParser
+from pr_guardian.models import CheckStatus, CodeAnalysisResult, UMLDiagram, UMLEntity
+from pr_guardian.parsers.plantuml_parser import PlantUMLParser, _parse_file_cached
 
 
-def _make_agent_no_llm(**kwargs):
-    """Create a UMLCheckerAgent with LLM disabled."""
-    agent = UMLCheckerAgent(**kwargs)
-    mock_settings = MagicMock()
-    mock_settings.llm_configured = False
-    agent._settings = mock_settings
-    return agent
+# Diagramme obsolète : aucune des classes touchées par la PR n'y figure
+_OLD_CLASS_PUML = """
+@startuml
+class OldClass {
+    +oldMethod()
+}
+@enduml
+"""
 
 
 class TestUMLCheckerAgent:
     """Tests pour UMLCheckerAgent."""
 
     @pytest.mark.asyncio
-    async def test_run_blocked_no_uml(self, sample_pr_context):
+    async def test_run_blocked_no_uml(self, stub_client, sample_pr_context):
         """Vérifie le statut BLOCKED quand aucun UML n'est trouvé."""
-        mock_gh = MagicMock()
-        mock_gh.find_uml_files.return_value = []
+        mock_gh = stub_client(
+            find_uml_files=[],
+        )
 
-        sample_pr_context.uml_files = []
+        context = sample_pr_context.model_copy(update={"uml_files": []})
 
-        agent = _make_agent_no_llm(github_client=mock_gh)
-        result = await agent.run(sample_pr_context)
+        agent = UMLCheckerAgent(github_client=mock_gh)
+        result = await agent.run(context)
 
         assert result.status == CheckStatus.BLOCKED
         assert "Aucun fichier PlantUML" in result.summary
 
     @pytest.mark.asyncio
-    async def test_run_parses_uml(self, sample_pr_context, sample_puml_content):
+    async def test_run_parses_uml(self, stub_client, sample_pr_context, sample_puml_content):
         """Vérifie le parsing des fichiers UML."""
-        mock_gh = MagicMock()
-        mock_gh.find_uml_files.return_value = ["docs/auth.puml"]
-        mock_gh.get_file_content.return_value = sample_puml_content
+        mock_gh = stub_client(
+            find_uml_files=["docs/auth.puml"],
+            get_file_content=sample_puml_content,
+        )
 
-        sample_pr_context.uml_files = []
+        context = sample_pr_context.model_copy(update={"uml_files": []})
 
-        agent = _make_agent_no_llm(github_client=mock_gh)
-        result = await agent.run(sample_pr_context)
+        agent = UMLCheckerAgent(github_client=mock_gh)
+        result = await agent.run(context)
 
         assert len(result.diagrams_found) == 1
         assert result.diagrams_found[0].diagram_type == "class"
@@ -55,51 +59,61 @@ class TestUMLCheckerAgent:
         assert "User" in entity_names
 
     @pytest.mark.asyncio
-    async def test_run_detects_mismatch(self, sample_pr_context, sample_puml_content, sample_code_analysis):
+    async def test_run_detects_mismatch(self, stub_client, sample_pr_context, sample_puml_content, sample_code_analysis):
         """Vérifie la détection des écarts code/UML."""
-        mock_gh = MagicMock()
-        mock_gh.find_uml_files.return_value = ["docs/auth.puml"]
-        mock_gh.get_file_content.return_value = """
-@startuml
-class OldClass {
-    +oldMethod()
-}
-@enduml
-"""
-        sample_pr_context.uml_files = []
+        mock_gh = stub_client(
+            find_uml_files=["docs/auth.puml"],
+            get_file_content=_OLD_CLASS_PUML,
+        )
+        context = sample_pr_context.model_copy(update={"uml_files": []})
 
         # Le code touche des classes qui ne sont pas dans l'UML
-        agent = _make_agent_no_llm(github_client=mock_gh)
-        result = await agent.run(sample_pr_context, code_analysis=sample_code_analysis)
+        agent = UMLCheckerAgent(github_client=mock_gh)
+        result = await agent.run(context, code_analysis=sample_code_analysis)
 
         # Il devrait y avoir des mismatches car les classes du code ne sont pas dans l'UML
         assert len(result.mismatches) > 0
-        mismatch_elements = [m.element.lower() for m in result.mismatches]
-        assert any("logincontroller" in e or "signupcontroller" in e or "authservice" in e 
-                   for e in mismatch_elements)
+        targets = ("logincontroller", "signupcontroller", "authservice")
+        elements = (m.element.lower() for m in result.mismatches)
+        assert any(t in e for e in elements for t in targets)
 
 
+@pytest.mark.xdist_group("plantuml_parser")
 class TestPlantUMLParser:
     """Tests pour le parseur PlantUML."""
 
-    def test_parse_class_diagram(self, sample_puml_content):
+    def test_parse_class_diagram(self, parsed_sample_puml):
         """Vérifie le parsing d'un diagramme de classes."""
-        diagram = PlantUMLParser.parse(sample_puml_content, "test.puml")
+        diagram = parsed_sample_puml
 
         assert diagram.diagram_type == "class"
         assert len(diagram.entities) >= 4  # AuthService, User, LoginController, SignupController
 
-    def test_parse_extracts_methods(self, sample_puml_content):
+    def test_parse_extracts_methods(self, parsed_sample_puml):
         """Vérifie l'extraction des méthodes."""
-        diagram = PlantUMLParser.parse(sample_puml_content, "test.puml")
+        diagram = parsed_sample_puml
 
-        auth_service = next((e for e in diagram.entities if e.name == "AuthService"), None)
+        auth_service = diagram.entities_by_name.get("AuthService")
         assert auth_service is not None
         assert len(auth_service.methods) >= 2
 
-    def test_parse_extracts_relations(self, sample_puml_content):
+    def test_entities_by_name_follows_list_changes(self):
+        """Vérifie que l'index suit les ajouts, suppressions et réassignations."""
+        diagram = UMLDiagram(filepath="d.puml", entities=[UMLEntity(name="A")])
+        assert set(diagram.entities_by_name) == {"A"}
+
+        diagram.entities.append(UMLEntity(name="B"))
+        assert set(diagram.entities_by_name) == {"A", "B"}
+
+        diagram.entities.pop(0)
+        assert set(diagram.entities_by_name) == {"B"}
+
+        diagram.entities = [UMLEntity(name="C")]
+        assert set(diagram.entities_by_name) == {"C"}
+
+    def test_parse_extracts_relations(self, parsed_sample_puml):
         """Vérifie l'extraction des relations."""
-        diagram = PlantUMLParser.parse(sample_puml_content, "test.puml")
+        diagram = parsed_sample_puml
 
         assert len(diagram.relations) >= 1
         relation_sources = [r.source for r in diagram.relations]
@@ -118,12 +132,76 @@ Server --> User: token
         diagram = PlantUMLParser.parse(content, "seq.puml")
         assert diagram.diagram_type == "sequence"
 
-    def test_classify_relation_inheritance(self):
-        """Vérifie la classification des relations d'héritage."""
-        assert PlantUMLParser._classify_relation("--|>") == "inheritance"
-        assert PlantUMLParser._classify_relation("<|--") == "inheritance"
-
-    def test_classify_relation_composition(self):
-        """Vérifie la classification des relations de composition."""
-        assert PlantUMLParser._classify_relation("--*") == "composition"
-        assert PlantUMLParser._classify_relation("*--") == "composition"
+    def test_parse_same_content_returns_independent_diagrams(self, sample_puml_content):
+        """Vérifie que le cache par contenu rend des diagrammes distincts."""
+        first = PlantUMLParser.parse(sample_puml_content, "a.puml")
+        second = PlantUMLParser.parse(sample_puml_content, "b.puml")
+
+        assert (first.filepath, second.filepath) == ("a.puml", "b.puml")
+        assert first.entities == second.entities
+        first.entities.clear()
+        assert second.entities
+
+    @pytest.mark.parametrize(
+        "arrow, kind",
+        [
+            ("--|>", "inheritance"),
+            ("<|--", "inheritance"),
+            ("--*", "composition"),
+            ("*--", "composition"),
+        ],
+    )
+    def test_classify_relation(self, arrow, kind):
+        """Vérifie la classification des relations (héritage, composition)."""
+        assert PlantUMLParser._classify_relation(arrow) == kind
+
+
+class TestPlantUMLParseFile:
+    """Tests pour PlantUMLParser.parse_file et son cache (chemin, mtime, taille)."""
+
+    def test_parse_file_cache_hit(self, tmp_path, sample_puml_content):
+        """Vérifie qu'un fichier inchangé n'est pas reparsé."""
+        path = tmp_path / "auth.puml"
+        path.write_text(sample_puml_content, encoding="utf-8")
+
+        first = PlantUMLParser.parse_file(str(path))
+        hits = _parse_file_cached.cache_info().hits
+        second = PlantUMLParser.parse_file(str(path))
+
+        assert _parse_file_cached.cache_info().hits == hits + 1
+        assert second == first
+
+    def test_parse_file_returns_copies(self, tmp_path, sample_puml_content):
+        """Vérifie qu'un appelant qui modifie le diagramme ne corrompt pas le cache."""
+        path = tmp_path / "auth.puml"
+        path.write_text(sample_puml_content, encoding="utf-8")
+
+        first = PlantUMLParser.parse_file(str(path))
+        first.entities.clear()
+        first.diagram_type = "altéré"
+
+        second = PlantUMLParser.parse_file(str(path))
+        assert second.diagram_type == "class"
+        assert second.entities_by_name.get("AuthService") is not None
+
+    def test_parse_file_invalidated_on_change(self, tmp_path):
+        """Vérifie qu'un fichier modifié (mtime différent) est reparsé."""
+        path = tmp_path / "model.puml"
+        path.write_text("@startuml\nclass Old {\n}\n@enduml\n", encoding="utf-8")
+        assert [e.name for e in PlantUMLParser.parse_file(str(path)).entities] == ["Old"]
+
+        path.write_text("@startuml\nclass New {\n}\n@enduml\n", encoding="utf-8")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert [e.name for e in PlantUMLParser.parse_file(str(path)).entities] == ["New"]
+
+    def test_parse_file_invalid_utf8(self, tmp_path):
+        """Vérifie que des octets non UTF-8 sont remplacés au lieu de faire échouer le parsing."""
+        path = tmp_path / "latin1.puml"
+        path.write_bytes("@startuml\nclass Résumé {\n}\n@enduml\n".encode("latin-1"))
+
+        diagram = PlantUMLParser.parse_file(str(path))
+
+        assert "�" in diagram.raw_content
+        assert diagram.diagram_type == "class"
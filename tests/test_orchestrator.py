@@ -1,38 +1,51 @@
 """Tests de l'orchestrateur."""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock
 
 from pr_guardian.orchestrator import Orchestrator
 from pr_guardian.models import (
     CheckStatus,
     CodeAnalysisResult,
     FigmaCheckResult,
+    FinalReport,
     JiraValidationResult,
     PRContext,
     UMLCheckResult,
+    ValidationRow,
     Verdict,
 )
 
 
+@pytest.fixture(scope="class")
+def orchestrator(stub_client, sample_pr_context):
+    """
+    Orchestrateur partagé par la classe, sur un client GitHub factice injecté.
+
+    build_pr_context renvoie une copie à chaque appel : les étapes qui
+    enrichissent le contexte ne fuient pas d'un test à l'autre. La session
+    HTTP est fermée même en cas d'échec.
+    """
+    gh = stub_client(
+        extract_jira_key="PROJ-123",
+        find_figma_links=[],
+        find_uml_files=[],
+    )
+    gh.build_pr_context = lambda *args, **kwargs: sample_pr_context.model_copy(deep=True)
+    orchestrator = Orchestrator(github_client=gh)
+    yield orchestrator
+    orchestrator.close()
+
+
 class TestOrchestrator:
     """Tests pour l'Orchestrator."""
 
     @pytest.mark.asyncio
-    async def test_step0_context_extracts_jira_key(self, sample_pr_context):
+    async def test_step0_context_extracts_jira_key(self, orchestrator):
         """Vérifie que le contexte extrait bien la clé Jira."""
-        with patch.object(Orchestrator, "_get_github") as mock_gh:
-            mock_client = MagicMock()
-            mock_client.build_pr_context.return_value = sample_pr_context
-            mock_client.extract_jira_key.return_value = "PROJ-123"
-            mock_client.find_figma_links.return_value = []
-            mock_client.find_uml_files.return_value = []
-            mock_gh.return_value = mock_client
+        context = await orchestrator._step0_context("Team7/test", 1, "main")
 
-            orchestrator = Orchestrator()
-            context = await orchestrator._step0_context("Team7/test", 1, "main")
-
-            assert context.jira_key == "PROJ-123"
+        assert context.jira_key == "PROJ-123"
 
     @pytest.mark.asyncio
     async def test_safe_run_catches_exceptions(self, sample_pr_context):
@@ -50,8 +63,6 @@ class TestOrchestrator:
 
     def test_format_pr_comment_pass(self, sample_pr_context, sample_judge_verdict_pass):
         """Vérifie le formatage du commentaire PR pour un PASS."""
-        from pr_guardian.models import FinalReport, ValidationRow
-
         report = FinalReport(
             pr_context=sample_pr_context,
             verdict=sample_judge_verdict_pass,
@@ -68,8 +79,6 @@ class TestOrchestrator:
 
     def test_format_pr_comment_fail(self, sample_pr_context, sample_judge_verdict_fail):
         """Vérifie le formatage du commentaire PR pour un FAIL."""
-        from pr_guardian.models import FinalReport, ValidationRow
-
         report = FinalReport(
             pr_context=sample_pr_context,
             verdict=sample_judge_verdict_fail,
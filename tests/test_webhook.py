@@ -0,0 +1,280 @@
+"""Tests du serveur webhook."""
+
+import asyncio
+import hashlib
+import hmac
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from starlette.testclient import TestClient
+
+from pr_guardian import webhook
+from pr_guardian.webhook import _extract_pr_fields, _verify_signature, create_app
+from pr_guardian.worker import RedisReviewQueue
+
+_SECRET = "s3cr3t"
+_BODY = b'{"action": "closed"}'
+
+
+def _sign(body: bytes, secret: str = _SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Application webhook avec un secret configuré."""
+    monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", _SECRET)
+    return TestClient(create_app())
+
+
+class TestSignature:
+    """Tests pour la vérification HMAC des webhooks."""
+
+    def test_verify_signature_valid(self):
+        """Vérifie qu'une signature correcte est acceptée."""
+        assert _verify_signature(_BODY, _sign(_BODY), _SECRET) is True
+
+    def test_verify_signature_invalid(self):
+        """Vérifie le rejet d'une signature forgée ou mal formée."""
+        assert _verify_signature(_BODY, _sign(_BODY, "autre"), _SECRET) is False
+        assert _verify_signature(_BODY, _sign(_BODY)[len("sha256="):], _SECRET) is False
+        assert _verify_signature(_BODY, "", _SECRET) is False
+
+    def test_webhook_rejects_bad_signature(self, client):
+        """Vérifie le 401 quand la signature ne correspond pas."""
+        resp = client.post(
+            "/webhook/github",
+            content=_BODY,
+            headers={"X-GitHub-Event": "pull_request", "X-Hub-Signature-256": "sha256=00"},
+        )
+        assert resp.status_code == 401
+
+    def test_webhook_accepts_good_signature(self, client):
+        """Vérifie qu'une requête signée est traitée."""
+        resp = client.post(
+            "/webhook/github",
+            content=_BODY,
+            headers={"X-GitHub-Event": "pull_request", "X-Hub-Signature-256": _sign(_BODY)},
+        )
+        assert resp.status_code == 200
+        assert "Action ignorée" in resp.json()["message"]
+
+    def test_webhook_ignores_other_events_before_auth(self, client):
+        """Vérifie qu'un événement non-PR est ignoré sans lecture du corps."""
+        resp = client.post(
+            "/webhook/github",
+            content=b"pas du json",
+            headers={"X-GitHub-Event": "push"},
+        )
+        assert resp.status_code == 200
+        assert "Événement ignoré" in resp.json()["message"]
+
+
+class TestAdmission:
+    """Tests pour la limite de revues concurrentes."""
+
+    async def test_reviews_bounded_by_max(self):
+        """Vérifie que jamais plus de state.max revues ne tournent en parallèle."""
+        running = peak = 0
+
+        class _FakeOrchestrator:
+            async def review_pr(self, repo, pr_number, branch):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                raise RuntimeError("pas de rapport")
+
+        state = webhook._ReviewState(2)
+        orch = _FakeOrchestrator()
+
+        await asyncio.gather(*(
+            webhook._run_review_bg(state, orch, "o/r", i, "b") for i in range(6)
+        ))
+        assert peak == 2
+        assert state.active == 0
+
+        await state.set_max(3)
+        await asyncio.gather(*(
+            webhook._run_review_bg(state, orch, "o/r", i, "b") for i in range(6)
+        ))
+        assert peak == 3
+
+
+class TestQueue:
+    """Tests pour la file des revues webhook."""
+
+    _PR_BODY = (
+        b'{"action": "opened", "repository": {"full_name": "o/r"},'
+        b' "pull_request": {"number": 7, "head": {"ref": "feat"}}}'
+    )
+
+    def test_full_queue_returns_503(self, monkeypatch):
+        """Vérifie le 503 + Retry-After quand la file est pleine."""
+        monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "")
+        monkeypatch.setenv("REVIEW_QUEUE_SIZE", "1")
+        monkeypatch.setenv("MAX_CONCURRENT_REVIEWS", "1")
+
+        async def _blocked(state, orchestrator, repo, pr_number, branch):
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(webhook, "_run_review_bg", _blocked)
+
+        headers = {"X-GitHub-Event": "pull_request"}
+        with TestClient(create_app()) as client:
+            statuses = [
+                client.post("/webhook/github", content=self._PR_BODY, headers=headers)
+                for _ in range(4)
+            ]
+        codes = [r.status_code for r in statuses]
+        assert codes[0] == 202
+        assert codes[-1] == 503
+        assert statuses[-1].headers["Retry-After"] == "30"
+
+    def test_redelivery_is_ignored(self, monkeypatch):
+        """Vérifie qu'une relivraison (même X-GitHub-Delivery) n'est pas remise en file."""
+        monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "")
+        monkeypatch.setenv("REDIS_URL", "")
+
+        async def _noop(state, orchestrator, repo, pr_number, branch):
+            pass
+
+        monkeypatch.setattr(webhook, "_run_review_bg", _noop)
+
+        headers = {"X-GitHub-Event": "pull_request", "X-GitHub-Delivery": "abc-123"}
+        with TestClient(create_app()) as client:
+            first = client.post("/webhook/github", content=self._PR_BODY, headers=headers)
+            second = client.post("/webhook/github", content=self._PR_BODY, headers=headers)
+        assert first.status_code == 202
+        assert first.headers["X-Review-PR"] == "7"
+        assert second.json()["message"] == "duplicate"
+
+    def test_redis_down_releases_delivery(self, monkeypatch):
+        """Vérifie qu'une panne Redis au test de doublon donne 503 sans consommer la livraison."""
+        monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "")
+        monkeypatch.setenv("REDIS_URL", "")
+        monkeypatch.setenv("REVIEW_QUEUE", "redis")
+        redis = AsyncMock()
+        redis.get.side_effect = [ConnectionError("down"), None]
+        redis.llen.return_value = 0
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock()
+        redis.pipeline = MagicMock(return_value=pipe)
+        monkeypatch.setattr(
+            webhook, "connect_review_queue", lambda url, maxsize: RedisReviewQueue(redis, maxsize)
+        )
+
+        body = (
+            b'{"action": "synchronize", "repository": {"full_name": "o/r"},'
+            b' "pull_request": {"number": 7, "head": {"ref": "feat", "sha": "abc"}}}'
+        )
+        headers = {"X-GitHub-Event": "pull_request", "X-GitHub-Delivery": "down-1"}
+        with TestClient(create_app()) as client:
+            first = client.post("/webhook/github", content=body, headers=headers)
+            retry = client.post("/webhook/github", content=body, headers=headers)
+        assert first.status_code == 503
+        assert first.headers["Retry-After"] == "30"
+        assert retry.status_code == 202
+
+    def test_non_latin1_branch(self, monkeypatch):
+        """Vérifie qu'une branche hors latin-1 est acceptée (en-tête percent-encodé)."""
+        monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "")
+        monkeypatch.setenv("REDIS_URL", "")
+
+        async def _noop(state, orchestrator, repo, pr_number, branch):
+            pass
+
+        monkeypatch.setattr(webhook, "_run_review_bg", _noop)
+
+        body = (
+            '{"action": "opened", "repository": {"full_name": "o/r"},'
+            ' "pull_request": {"number": 7, "head": {"ref": "feat/日本"}}}'
+        ).encode()
+        headers = {"X-GitHub-Event": "pull_request", "X-GitHub-Delivery": "jp-1"}
+        with TestClient(create_app()) as client:
+            resp = client.post("/webhook/github", content=body, headers=headers)
+        assert resp.status_code == 202
+        assert resp.headers["X-Review-Branch"] == "feat/%E6%97%A5%E6%9C%AC"
+
+    def test_same_commit_is_coalesced(self, monkeypatch):
+        """Vérifie qu'un commit déjà en file n'est pas remis en file."""
+        monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "")
+
+        async def _blocked(state, orchestrator, repo, pr_number, branch):
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(webhook, "_run_review_bg", _blocked)
+
+        def _sync(sha: str) -> bytes:
+            return (
+                b'{"action": "synchronize", "repository": {"full_name": "o/r"},'
+                b' "pull_request": {"number": 7, "head": {"ref": "feat", "sha": "'
+                + sha.encode() + b'"}}}'
+            )
+
+        headers = {"X-GitHub-Event": "pull_request"}
+        with TestClient(create_app()) as client:
+            first = client.post("/webhook/github", content=_sync("aaa"), headers=headers)
+            newer = client.post("/webhook/github", content=_sync("bbb"), headers=headers)
+            again = client.post("/webhook/github", content=_sync("bbb"), headers=headers)
+        assert first.status_code == 202
+        assert newer.status_code == 202
+        assert again.status_code == 200
+        assert "déjà planifiée" in again.json()["message"]
+
+
+@pytest.fixture(params=["msgspec", "ijson", "json"])
+def decoder(request, monkeypatch):
+    """Force l'un des trois chemins de décodage de _extract_pr_fields."""
+    if request.param == "msgspec" and webhook._payload_decoder is None:
+        pytest.skip("msgspec non installé")
+    if request.param == "ijson" and webhook.ijson is None:
+        pytest.skip("ijson (backend C) non installé")
+    if request.param != "msgspec":
+        monkeypatch.setattr(webhook, "_payload_decoder", None)
+    if request.param == "json":
+        monkeypatch.setattr(webhook, "ijson", None)
+    return request.param
+
+
+class TestExtractFields:
+    """Tests pour l'extraction des champs utiles du payload (tous décodeurs)."""
+
+    def test_extract_pr_fields(self, decoder):
+        """Vérifie que seuls les champs utiles sont extraits, quel que soit leur ordre."""
+        body = (
+            b'{"repository": {"full_name": "o/r", "owner": {"login": "o"}},'
+            b' "pull_request": {"labels": [{"name": "x"}], "number": 7,'
+            b' "head": {"ref": "feat", "sha": "abc", "repo": {"full_name": "fork/r"}}},'
+            b' "action": "opened"}'
+        )
+        assert _extract_pr_fields(body) == {
+            "action": "opened", "repo": "o/r", "number": 7, "branch": "feat", "sha": "abc",
+        }
+
+    def test_extract_pr_fields_invalid_json(self, decoder):
+        """Vérifie qu'un JSON invalide lève ValueError."""
+        with pytest.raises(ValueError):
+            _extract_pr_fields(b'{"action": ')
+
+    @pytest.mark.parametrize("body", [
+        b'[]',
+        b'"x"',
+        b'1',
+        b'{"action": "opened", "pull_request": [1]}',
+        b'{"action": "opened", "repository": {"full_name": "o/r"},'
+        b' "pull_request": {"number": "x"}}',
+        b'{"action": "opened", "repository": "o/r", "pull_request": {"number": 7}}',
+        b'{"action": "opened", "repository": {"full_name": "o/r"},'
+        b' "pull_request": {"number": 7, "head": {"ref": ["feat"]}}}',
+    ])
+    def test_malformed_payload_returns_400(self, decoder, body, monkeypatch):
+        """Vérifie qu'un payload mal typé donne 400, jamais 500."""
+        monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "")
+        client = TestClient(create_app(), raise_server_exceptions=False)
+        resp = client.post(
+            "/webhook/github", content=body, headers={"X-GitHub-Event": "pull_request"}
+        )
+        assert resp.status_code == 400
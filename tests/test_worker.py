@@ -0,0 +1,161 @@
+"""Tests du worker de revue (file Redis)."""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from pr_guardian import worker
+from pr_guardian.worker import RedisReviewQueue, _consume
+
+_ITEM = b'{"repo": "o/r", "pr": 7, "branch": "feat", "sha": "abc"}'
+
+
+def _redis(**overrides) -> AsyncMock:
+    redis = AsyncMock()
+    redis.llen.return_value = 0
+    redis.get.return_value = None
+    # Pipeline MULTI : commandes mises en tampon, appliquées par execute()
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock()
+    redis.pipeline = MagicMock(return_value=pipe)
+    for name, value in overrides.items():
+        getattr(redis, name).return_value = value
+    return redis
+
+
+class _FakeRedis:
+    """Redis en mémoire (chaînes seulement) ; ``on_read`` s'exécute après chaque lecture."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.on_read = None
+
+    async def _after_read(self):
+        if self.on_read is not None:
+            hook, self.on_read = self.on_read, None
+            await hook()
+
+    async def get(self, key):
+        value = self.data.get(key)
+        await self._after_read()
+        return value
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    async def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    async def eval(self, script, numkeys, key, value):
+        assert script == worker._RELEASE_SCRIPT
+        deleted = 0
+        if self.data.get(key) == value.encode():
+            deleted = await self.delete(key)
+        await self._after_read()
+        return deleted
+
+
+class TestRedisReviewQueue:
+    """Tests pour RedisReviewQueue."""
+
+    async def test_put_pushes_item_and_latest_sha(self):
+        """Vérifie que put enregistre le dernier commit et pousse l'élément en une transaction."""
+        redis = _redis()
+        await RedisReviewQueue(redis, maxsize=10).put("o/r", 7, "feat", "abc")
+
+        redis.pipeline.assert_called_once_with(transaction=True)
+        pipe = redis.pipeline.return_value
+        pipe.set.assert_called_once_with(
+            "pr_guardian:latest_sha:o/r#7", "abc", ex=worker._LATEST_TTL
+        )
+        key, raw = pipe.rpush.call_args.args
+        assert key == "pr_guardian:reviews"
+        assert json.loads(raw) == {"repo": "o/r", "pr": 7, "branch": "feat", "sha": "abc"}
+
+    async def test_put_full_queue(self):
+        """Vérifie QueueFull quand la file atteint maxsize."""
+        redis = _redis(llen=10)
+        with pytest.raises(asyncio.QueueFull):
+            await RedisReviewQueue(redis, maxsize=10).put("o/r", 7, "feat", "abc")
+        redis.pipeline.assert_not_called()
+
+    async def test_put_redis_down(self):
+        """Vérifie qu'une panne Redis donne QueueFull (→ 503) sans commit orphelin."""
+        redis = _redis()
+        redis.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        with pytest.raises(asyncio.QueueFull):
+            await RedisReviewQueue(redis).put("o/r", 7, "feat", "abc")
+        # Le dernier commit n'est écrit que dans la transaction avortée
+        redis.set.assert_not_awaited()
+        redis.hset.assert_not_awaited()
+        assert await RedisReviewQueue(redis).is_pending("o/r", 7, "abc") is False
+
+    async def test_done_only_clears_latest_commit(self):
+        """Vérifie que done n'efface pas le commit d'un push plus récent."""
+        redis = _FakeRedis()
+        redis.data["pr_guardian:latest_sha:o/r#7"] = b"def"
+        queue = RedisReviewQueue(redis)
+
+        await queue.done("o/r", 7, "abc")
+        assert await queue.is_pending("o/r", 7, "def")
+
+        await queue.done("o/r", 7, "def")
+        assert redis.data == {}
+
+    async def test_done_races_newer_push(self):
+        """Vérifie qu'un push arrivé pendant done() n'est pas effacé."""
+        redis = _FakeRedis()
+        redis.data["pr_guardian:latest_sha:o/r#7"] = b"abc"
+        queue = RedisReviewQueue(redis)
+
+        async def _newer_push():
+            await redis.set("pr_guardian:latest_sha:o/r#7", "def")
+
+        redis.on_read = _newer_push  # le SET du push suivant juste après la lecture
+        await queue.done("o/r", 7, "abc")
+        assert await queue.is_pending("o/r", 7, "def")
+
+    async def test_get_skips_malformed_items(self):
+        """Vérifie que les éléments mal formés sont ignorés sans interrompre la lecture."""
+        redis = _redis()
+        redis.blpop.side_effect = [
+            (b"k", b"pas du json"), (b"k", b'{"pr": 7}'), (b"k", b"[1]"), (b"k", _ITEM),
+        ]
+        assert await RedisReviewQueue(redis).get() == ("o/r", 7, "feat", "abc")
+
+
+class TestConsume:
+    """Tests pour la boucle des workers."""
+
+    async def test_consumer_survives_queue_errors(self, monkeypatch):
+        """Vérifie qu'une erreur Redis ou un élément invalide n'arrête pas le worker."""
+        monkeypatch.setattr(worker, "_RETRY_DELAY", 0)
+        redis = _redis(get=b"abc")
+        redis.blpop.side_effect = [
+            ConnectionError("blip"), (b"k", b"pas du json"), (b"k", _ITEM),
+            asyncio.CancelledError(),
+        ]
+        orchestrator = MagicMock()
+        orchestrator.review_pr = AsyncMock(side_effect=RuntimeError("pas de rapport"))
+
+        with pytest.raises(asyncio.CancelledError):
+            await _consume(RedisReviewQueue(redis), orchestrator)
+        orchestrator.review_pr.assert_awaited_once_with("o/r", 7, "feat")
+        redis.eval.assert_awaited_once_with(
+            worker._RELEASE_SCRIPT, 1, "pr_guardian:latest_sha:o/r#7", "abc"
+        )
+
+    @pytest.mark.parametrize("latest, reviewed", [(b"abc", True), (None, True), (b"def", False)])
+    async def test_consumer_skips_only_superseded(self, latest, reviewed):
+        """Vérifie qu'une clé expirée (None) ne fait pas sauter la revue, un push plus récent si."""
+        redis = _redis(get=latest)
+        redis.blpop.side_effect = [(b"k", _ITEM), asyncio.CancelledError()]
+        orchestrator = MagicMock()
+        orchestrator.review_pr = AsyncMock(side_effect=RuntimeError("pas de rapport"))
+
+        with pytest.raises(asyncio.CancelledError):
+            await _consume(RedisReviewQueue(redis), orchestrator)
+        assert orchestrator.review_pr.await_count == int(reviewed)